@@ -4,12 +4,24 @@ from jose import JWTError, jwt
 from passlib.context import CryptContext
 from datetime import datetime, timedelta
 from pydantic import BaseModel
+from collections import OrderedDict, deque
+from functools import lru_cache
+from starlette.concurrency import run_in_threadpool
+import hashlib
+import math
 import os
+import sys
+import time
 
 # JWT Configuration
 SECRET_KEY = os.environ.get("JWT_SECRET", "centrometis-super-secret-key-2024-admin-panel")
 ALGORITHM = "HS256"
 ACCESS_TOKEN_EXPIRE_MINUTES = 480  # 8 hours
+TOKEN_CACHE_SIZE = int(os.environ.get("TOKEN_CACHE_SIZE", "256"))
+
+# Login throttling: at most LOGIN_RATE_LIMIT failed attempts per (client, email) in LOGIN_RATE_WINDOW seconds
+LOGIN_RATE_LIMIT = int(os.environ.get("LOGIN_RATE_LIMIT", "10"))
+LOGIN_RATE_WINDOW = int(os.environ.get("LOGIN_RATE_WINDOW", "300"))
 
 # Password hashing
 pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
@@ -19,7 +31,14 @@ security = HTTPBearer()
 
 # Admin credentials - secure defaults
 ADMIN_EMAIL = os.environ.get("ADMIN_EMAIL", "admin@centrometis.com")
-ADMIN_PASSWORD_HASH = pwd_context.hash(os.environ.get("ADMIN_PASSWORD", "CentroMetis@2024!Admin"))
+# Precomputed bcrypt hash (see `python auth.py hash-password`); avoids hashing at import time
+ADMIN_PASSWORD_HASH = os.environ.get("ADMIN_PASSWORD_HASH")
+
+
+@lru_cache(maxsize=1)
+def get_admin_password_hash() -> str:
+    # Fallback when no precomputed hash is configured: hash once, on first login
+    return ADMIN_PASSWORD_HASH or pwd_context.hash(os.environ.get("ADMIN_PASSWORD", "CentroMetis@2024!Admin"))
 
 
 class Token(BaseModel):
@@ -41,6 +60,107 @@ class AdminUser(BaseModel):
     name: str = "Amministratore"
 
 
+class TokenCache:
+    """Bounded LRU of already verified tokens, keyed by the token's sha256 digest."""
+
+    def __init__(self, max_entries: int):
+        self.max_entries = max_entries
+        self._entries: OrderedDict[bytes, tuple[float, AdminUser]] = OrderedDict()
+
+    @staticmethod
+    def _key(token: str) -> bytes:
+        return hashlib.sha256(token.encode()).digest()
+
+    def get(self, token: str) -> AdminUser | None:
+        key = self._key(token)
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        expires_at, admin = entry
+        if expires_at <= time.time():
+            del self._entries[key]
+            return None
+        self._entries.move_to_end(key)
+        return admin
+
+    def set(self, token: str, expires_at: float, admin: AdminUser) -> None:
+        key = self._key(token)
+        self._entries[key] = (expires_at, admin)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+
+token_cache = TokenCache(TOKEN_CACHE_SIZE)
+
+
+class LoginRateLimiter:
+    """Sliding-window limit on failed login attempts per key, checked before any bcrypt work."""
+
+    def __init__(self, limit: int, window: int):
+        self.limit = limit
+        self.window = window
+        self._failures: dict[tuple, deque[float]] = {}
+
+    def retry_after(self, key: tuple) -> float | None:
+        """Seconds to wait if the key is over the limit, else None."""
+        now = time.monotonic()
+        failures = self._failures.get(key)
+        if not failures:
+            return None
+        while failures and failures[0] <= now - self.window:
+            failures.popleft()
+        if len(failures) >= self.limit:
+            return failures[0] + self.window - now
+        return None
+
+    def record_failure(self, key: tuple) -> None:
+        now = time.monotonic()
+        if len(self._failures) > 10000:
+            self._prune(now)
+        self._failures.setdefault(key, deque()).append(now)
+
+    def reset(self, key: tuple) -> None:
+        self._failures.pop(key, None)
+
+    def _prune(self, now: float) -> None:
+        for key in [k for k, v in self._failures.items() if not v or v[-1] <= now - self.window]:
+            del self._failures[key]
+
+
+login_rate_limiter = LoginRateLimiter(LOGIN_RATE_LIMIT, LOGIN_RATE_WINDOW)
+
+
+def login_rate_key(client: str, email: str) -> tuple[str, str]:
+    # Per client and account: a flood against one address can't lock out the admin elsewhere
+    return client, email.strip().lower()
+
+
+def check_login_rate(key: tuple) -> None:
+    retry_after = login_rate_limiter.retry_after(key)
+    if retry_after is not None:
+        raise HTTPException(
+            status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+            detail="Troppi tentativi di accesso, riprova più tardi",
+            headers={"Retry-After": str(math.ceil(retry_after))},
+        )
+
+
+def proxy_headers_trusted() -> bool:
+    """Whether uvicorn rewrites request.client from X-Forwarded-For for a non-local proxy.
+
+    uvicorn trusts only 127.0.0.1 unless --forwarded-allow-ips or FORWARDED_ALLOW_IPS says otherwise.
+    """
+    if "--no-proxy-headers" in sys.argv:
+        return False
+    if any(arg.startswith("--forwarded-allow-ips") for arg in sys.argv):
+        return True
+    return os.environ.get("FORWARDED_ALLOW_IPS", "127.0.0.1").strip() not in ("", "127.0.0.1")
+
+
 def verify_password(plain_password: str, hashed_password: str) -> bool:
     return pwd_context.verify(plain_password, hashed_password)
 
@@ -56,8 +176,12 @@ def create_access_token(data: dict, expires_delta: timedelta | None = None) -> s
     return encoded_jwt
 
 
-def authenticate_admin(email: str, password: str) -> AdminUser | None:
-    if email == ADMIN_EMAIL and verify_password(password, ADMIN_PASSWORD_HASH):
+async def authenticate_admin(email: str, password: str) -> AdminUser | None:
+    if email != ADMIN_EMAIL:
+        return None
+    # bcrypt takes ~250 ms of CPU; keep it off the event loop
+    password_hash = await run_in_threadpool(get_admin_password_hash)
+    if await run_in_threadpool(verify_password, password, password_hash):
         return AdminUser(email=email)
     return None
 
@@ -68,8 +192,13 @@ async def get_current_admin(credentials: HTTPAuthorizationCredentials = Depends(
         detail="Token non valido o scaduto",
         headers={"WWW-Authenticate": "Bearer"},
     )
+    token = credentials.credentials
+    # Tokens already verified skip the HMAC check and model construction until they expire
+    admin = token_cache.get(token)
+    if admin is not None:
+        return admin
+    
     try:
-        token = credentials.credentials
         payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
         email: str = payload.get("sub")
         if email is None:
@@ -81,4 +210,16 @@ async def get_current_admin(credentials: HTTPAuthorizationCredentials = Depends(
     if token_data.email != ADMIN_EMAIL:
         raise credentials_exception
     
-    return AdminUser(email=token_data.email)
+    admin = AdminUser(email=token_data.email)
+    if payload.get("exp") is not None:
+        token_cache.set(token, float(payload["exp"]), admin)
+    return admin
+
+
+if __name__ == "__main__":
+    # Print a bcrypt hash to put in ADMIN_PASSWORD_HASH at build/deploy time
+    if sys.argv[1:] != ["hash-password"]:
+        print("Uso: python auth.py hash-password")
+        sys.exit(1)
+    from getpass import getpass
+    print(pwd_context.hash(getpass("Password amministratore: ")))
@@ -0,0 +1,83 @@
+"""
+Latency of an admin edit: update_one + find_one (two round trips) versus one
+find_one_and_update(return_document=AFTER), as done by Repository.update.
+
+Runs against MONGO_URL/DB_NAME from backend/.env, in a scratch collection that
+is dropped afterwards.
+
+Usage: python benchmarks/bench_updates.py [iterations]
+"""
+import asyncio
+import os
+import statistics
+import sys
+import time
+import uuid
+from datetime import datetime
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from dotenv import load_dotenv  # noqa: E402
+from pymongo import ReturnDocument  # noqa: E402
+
+from database import create_client  # noqa: E402
+
+COLLECTION = "bench_updates"
+
+
+async def two_round_trips(collection, doc_id: str, price: float) -> dict:
+    await collection.update_one({"id": doc_id}, {"$set": {"price": price, "updatedAt": datetime.utcnow()}})
+    return await collection.find_one({"id": doc_id}, {"_id": 0})
+
+
+async def one_round_trip(collection, doc_id: str, price: float) -> dict:
+    return await collection.find_one_and_update(
+        {"id": doc_id},
+        {"$set": {"price": price, "updatedAt": datetime.utcnow()}},
+        projection={"_id": 0},
+        return_document=ReturnDocument.AFTER
+    )
+
+
+async def measure(update, collection, doc_id: str, iterations: int) -> list[float]:
+    timings = []
+    for i in range(iterations):
+        start = time.perf_counter()
+        doc = await update(collection, doc_id, float(i))
+        timings.append((time.perf_counter() - start) * 1000)
+        assert doc["price"] == float(i)
+    return timings
+
+
+def summary(timings: list[float]) -> str:
+    p95 = statistics.quantiles(timings, n=20)[-1]
+    return f"median {statistics.median(timings):7.3f} ms   p95 {p95:7.3f} ms"
+
+
+async def main(iterations: int):
+    load_dotenv(Path(__file__).resolve().parent.parent / '.env')
+    client = create_client(os.environ['MONGO_URL'])
+    collection = client[os.environ['DB_NAME']][COLLECTION]
+    doc_id = str(uuid.uuid4())
+    try:
+        await collection.create_index("id", unique=True)
+        await collection.insert_one({"id": doc_id, "name": "Benchmark", "price": 0.0})
+        # Warm up the pool and the plan cache
+        await measure(two_round_trips, collection, doc_id, 20)
+        await measure(one_round_trip, collection, doc_id, 20)
+
+        before = await measure(two_round_trips, collection, doc_id, iterations)
+        after = await measure(one_round_trip, collection, doc_id, iterations)
+    finally:
+        await collection.drop()
+        client.close()
+
+    print(f"Admin edit latency over {iterations} updates")
+    print(f"  update_one + find_one:  {summary(before)}")
+    print(f"  find_one_and_update:    {summary(after)}")
+    print(f"  median speedup:         {statistics.median(before) / statistics.median(after):7.2f}x")
+
+
+if __name__ == "__main__":
+    asyncio.run(main(int(sys.argv[1]) if len(sys.argv) > 1 else 500))
@@ -0,0 +1,141 @@
+import csv
+import io
+import os
+import uuid
+from datetime import datetime
+from typing import AsyncIterator, NamedTuple, Type
+
+import orjson
+from pydantic import BaseModel, ValidationError
+from pymongo import UpdateOne
+from pymongo.errors import BulkWriteError
+
+from models import ProductCreate, ServiceCreate, BlogPostCreate
+
+BULK_BATCH_SIZE = int(os.environ.get("BULK_BATCH_SIZE", "500"))
+
+# CSV cells holding lists ("a|b|c") or JSON documents
+CSV_LIST_FIELDS = {"benefits", "ingredients"}
+CSV_JSON_FIELDS = {"nutritionalInfo", "imageSrcset"}
+
+
+class BulkCollection(NamedTuple):
+    collection: str
+    model: Type[BaseModel]
+
+
+BULK_COLLECTIONS = {
+    "products": BulkCollection("products", ProductCreate),
+    "services": BulkCollection("services", ServiceCreate),
+    "blog_posts": BulkCollection("blog_posts", BlogPostCreate),
+}
+
+
+def parse_ndjson(body: bytes) -> list[tuple[int, dict | Exception]]:
+    rows = []
+    for number, line in enumerate(body.splitlines(), start=1):
+        if not line.strip():
+            continue
+        try:
+            row = orjson.loads(line)
+            if not isinstance(row, dict):
+                raise ValueError("expected a JSON object")
+        except (orjson.JSONDecodeError, ValueError) as exc:
+            row = exc
+        rows.append((number, row))
+    return rows
+
+
+def parse_csv(body: bytes) -> list[tuple[int, dict | Exception]]:
+    """Raises ValueError for a file that can't be read at all (wrong encoding, broken quoting)."""
+    try:
+        text = body.decode("utf-8-sig")
+    except UnicodeDecodeError as exc:
+        raise ValueError(f"CSV must be UTF-8 encoded (invalid byte at position {exc.start})") from exc
+    rows = []
+    reader = csv.DictReader(io.StringIO(text, newline=""))
+    try:
+        # Row 1 is the header
+        for number, raw in enumerate(reader, start=2):
+            rows.append((number, _csv_row(raw)))
+    except csv.Error as exc:
+        raise ValueError(f"Malformed CSV near line {reader.line_num + 1}: {exc}") from exc
+    return rows
+
+
+def _csv_row(raw: dict) -> dict | Exception:
+    row = {}
+    try:
+        for field, value in raw.items():
+            if field is None or value is None or value == "":
+                continue
+            if field in CSV_LIST_FIELDS:
+                row[field] = [item.strip() for item in value.split("|") if item.strip()]
+            elif field in CSV_JSON_FIELDS:
+                row[field] = orjson.loads(value)
+            else:
+                row[field] = value
+    except orjson.JSONDecodeError as exc:
+        return exc
+    return row
+
+
+def _describe(exc: Exception) -> str:
+    if isinstance(exc, ValidationError):
+        return "; ".join(
+            f"{'.'.join(str(part) for part in error['loc'])}: {error['msg']}" for error in exc.errors()
+        )
+    return str(exc)
+
+
+async def _write_batch(collection, batch: list[tuple[int, UpdateOne]], report: dict) -> None:
+    try:
+        result = await collection.bulk_write([op for _, op in batch], ordered=False)
+        details = result.bulk_api_result
+    except BulkWriteError as exc:
+        details = exc.details
+        for error in details.get("writeErrors", []):
+            report["errors"].append({"row": batch[error["index"]][0], "error": error.get("errmsg", "write error")})
+    report["inserted"] += details.get("nUpserted", 0)
+    report["matched"] += details.get("nMatched", 0)
+    report["modified"] += details.get("nModified", 0)
+
+
+async def bulk_upsert(db, target: BulkCollection, rows: list[tuple[int, dict | Exception]]) -> dict:
+    """Validate rows and upsert them by `id` in unordered batches, collecting per-row errors.
+
+    Rows without an `id` are inserted with a new one.
+    """
+    report = {"received": len(rows), "inserted": 0, "matched": 0, "modified": 0, "errors": []}
+    collection = db[target.collection]
+    now = datetime.utcnow()
+    batch = []
+    for number, row in rows:
+        if isinstance(row, Exception):
+            report["errors"].append({"row": number, "error": _describe(row)})
+            continue
+        try:
+            document = target.model(**row).dict()
+        except ValidationError as exc:
+            report["errors"].append({"row": number, "error": _describe(exc)})
+            continue
+        doc_id = str(row.get("id") or uuid.uuid4())
+        batch.append((number, UpdateOne(
+            {"id": doc_id},
+            {"$set": {**document, "updatedAt": now}, "$setOnInsert": {"createdAt": now}},
+            upsert=True
+        )))
+        if len(batch) >= BULK_BATCH_SIZE:
+            await _write_batch(collection, batch, report)
+            batch = []
+    if batch:
+        await _write_batch(collection, batch, report)
+    report["errors"].sort(key=lambda error: error["row"])
+    return report
+
+
+async def export_ndjson(db, target: BulkCollection) -> AsyncIterator[bytes]:
+    """Stream every document as one JSON line, in `id` order (the format bulk_upsert accepts)."""
+    cursor = db[target.collection].find({}, {"_id": 0}).sort("id", 1).batch_size(BULK_BATCH_SIZE)
+    async for document in cursor:
+        yield orjson.dumps(document) + b"\n"
@@ -0,0 +1,92 @@
+import os
+import time
+from typing import Any, Awaitable, Callable, Hashable
+
+# Catalog cache configuration
+CATALOG_CACHE_TTL = float(os.environ.get("CATALOG_CACHE_TTL", "60"))  # seconds
+CATALOG_CACHE_MAX_ENTRIES = int(os.environ.get("CATALOG_CACHE_MAX_ENTRIES", "1024"))
+
+_MISSING = object()
+
+
+class TTLCache:
+    """In-process cache whose keys are tuples starting with a namespace.
+
+    Entries expire after `ttl` seconds and a whole namespace (e.g. "products")
+    can be dropped at once when the matching collection is written.
+    """
+
+    def __init__(self, ttl: float, max_entries: int = 1024):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self._entries: dict[tuple, tuple[float, Any]] = {}
+        self._versions: dict[Hashable, int] = {}
+
+    def get(self, key: tuple, default: Any = None) -> Any:
+        entry = self._entries.get(key)
+        if entry is not None and entry[0] > time.monotonic():
+            self.hits += 1
+            return entry[1]
+        if entry is not None:
+            del self._entries[key]
+        self.misses += 1
+        return default
+
+    def set(self, key: tuple, value: Any) -> None:
+        if key not in self._entries and len(self._entries) >= self.max_entries:
+            self._evict()
+        self._entries[key] = (time.monotonic() + self.ttl, value)
+
+    def update(self, key: tuple, func: Callable[[Any], Any]) -> None:
+        """Apply `func` to a live entry in place, keeping its expiry.
+
+        Bumps the namespace version so loads already in flight don't overwrite the change.
+        """
+        self._versions[key[0]] = self.version(key[0]) + 1
+        entry = self._entries.get(key)
+        if entry is not None and entry[0] > time.monotonic():
+            self._entries[key] = (entry[0], func(entry[1]))
+
+    def discard(self, key: tuple) -> None:
+        self._entries.pop(key, None)
+
+    def invalidate(self, namespace: Hashable) -> None:
+        self._versions[namespace] = self._versions.get(namespace, 0) + 1
+        for key in [k for k in self._entries if k[0] == namespace]:
+            del self._entries[key]
+
+    def version(self, namespace: Hashable) -> int:
+        return self._versions.get(namespace, 0)
+
+    async def get_or_load(self, key: tuple, loader: Callable[[], Awaitable[Any]]) -> Any:
+        value = self.get(key, _MISSING)
+        if value is not _MISSING:
+            return value
+        # Don't store a value loaded before a concurrent write invalidated the namespace
+        version = self.version(key[0])
+        value = await loader()
+        if self.version(key[0]) == version:
+            self.set(key, value)
+        return value
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hitRatio": round(self.hits / lookups, 4) if lookups else 0.0,
+            "entries": len(self._entries),
+        }
+
+    def _evict(self) -> None:
+        now = time.monotonic()
+        for key in [k for k, (expires, _) in self._entries.items() if expires <= now]:
+            del self._entries[key]
+        if len(self._entries) >= self.max_entries:
+            # Dicts keep insertion order, so the first key is the oldest entry
+            del self._entries[next(iter(self._entries))]
+
+
+catalog_cache = TTLCache(CATALOG_CACHE_TTL, CATALOG_CACHE_MAX_ENTRIES)
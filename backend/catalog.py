@@ -0,0 +1,98 @@
+from typing import NamedTuple, Optional
+
+# Sort orders accepted by GET /products; each ends with `id` so pages are stable
+PRODUCT_SORTS = {
+    "newest": [("createdAt", -1), ("id", -1)],
+    "price_asc": [("price", 1), ("id", 1)],
+    "price_desc": [("price", -1), ("id", -1)],
+    "name": [("name", 1), ("id", 1)],
+}
+PRODUCT_SORT_PATTERN = f"^({'|'.join(PRODUCT_SORTS)})$"
+
+FLAG_FIELDS = ("inStock", "glutenFree", "lactoseFree")
+
+
+def _values(value: Optional[str]) -> list[str]:
+    return [v.strip() for v in (value or "").split(",") if v.strip()]
+
+
+class ProductFilters(NamedTuple):
+    """Catalog predicates from the query string; `category`, `brand` and `flavor` accept comma-separated values."""
+
+    featured: Optional[bool] = None
+    category: Optional[str] = None
+    brand: Optional[str] = None
+    flavor: Optional[str] = None
+    minPrice: Optional[float] = None
+    maxPrice: Optional[float] = None
+    inStock: Optional[bool] = None
+    glutenFree: Optional[bool] = None
+    lactoseFree: Optional[bool] = None
+
+    def query(self, exclude: tuple[str, ...] = ()) -> dict:
+        """MongoDB filter for every predicate except the `exclude`d fields."""
+        query = {}
+        for field in ("featured", *FLAG_FIELDS):
+            value = getattr(self, field)
+            if value is not None and field not in exclude:
+                query[field] = value
+        for field in ("category", "brand", "flavor"):
+            values = _values(getattr(self, field))
+            if values and field not in exclude:
+                query[field] = values[0] if len(values) == 1 else {"$in": values}
+        if "price" not in exclude:
+            price = {}
+            if self.minPrice is not None:
+                price["$gte"] = self.minPrice
+            if self.maxPrice is not None:
+                price["$lte"] = self.maxPrice
+            if price:
+                query["price"] = price
+        return query
+
+
+def _count_by(field: str) -> list[dict]:
+    return [
+        {"$group": {"_id": f"${field}", "count": {"$sum": 1}}},
+        {"$match": {"_id": {"$nin": [None, ""]}}},
+        {"$sort": {"count": -1, "_id": 1}},
+    ]
+
+
+def facet_pipeline(filters: ProductFilters) -> list[dict]:
+    """One $facet over the catalog.
+
+    Each facet ignores its own predicate, so the counts show what selecting
+    another value would return (e.g. every category stays listed once one is picked).
+    """
+    return [{"$facet": {
+        "total": [{"$match": filters.query()}, {"$count": "count"}],
+        "categories": [{"$match": filters.query(("category",))}, *_count_by("category")],
+        "brands": [{"$match": filters.query(("brand",))}, *_count_by("brand")],
+        "flavors": [{"$match": filters.query(("flavor",))}, *_count_by("flavor")],
+        "price": [
+            {"$match": filters.query(("price",))},
+            {"$group": {"_id": None, "min": {"$min": "$price"}, "max": {"$max": "$price"}}},
+        ],
+        "flags": [
+            {"$match": filters.query(FLAG_FIELDS)},
+            {"$group": {
+                "_id": None,
+                **{field: {"$sum": {"$cond": [{"$eq": [f"${field}", True]}, 1, 0]}} for field in FLAG_FIELDS},
+            }},
+        ],
+    }}]
+
+
+async def product_facets(db, filters: ProductFilters) -> dict:
+    result = (await db.products.aggregate(facet_pipeline(filters)).to_list(1))[0]
+    price = result["price"][0] if result["price"] else {"min": None, "max": None}
+    flags = result["flags"][0] if result["flags"] else {}
+    return {
+        "total": result["total"][0]["count"] if result["total"] else 0,
+        "categories": [{"value": b["_id"], "count": b["count"]} for b in result["categories"]],
+        "brands": [{"value": b["_id"], "count": b["count"]} for b in result["brands"]],
+        "flavors": [{"value": b["_id"], "count": b["count"]} for b in result["flavors"]],
+        "price": {"min": price["min"], "max": price["max"]},
+        **{field: flags.get(field, 0) for field in FLAG_FIELDS},
+    }
@@ -0,0 +1,135 @@
+import asyncio
+import os
+import threading
+import time
+
+from motor.motor_asyncio import AsyncIOMotorClient
+from pymongo import monitoring
+from pymongo.errors import PyMongoError
+
+from metrics import Gauge, command_metrics, registry
+from profiling import command_recorder
+
+# Connection pool (per MongoDB server) and timeouts
+MONGO_MAX_POOL_SIZE = int(os.environ.get("MONGO_MAX_POOL_SIZE", "100"))
+MONGO_MIN_POOL_SIZE = int(os.environ.get("MONGO_MIN_POOL_SIZE", "0"))
+MONGO_MAX_IDLE_TIME_MS = int(os.environ.get("MONGO_MAX_IDLE_TIME_MS", "60000"))
+MONGO_WAIT_QUEUE_TIMEOUT_MS = int(os.environ.get("MONGO_WAIT_QUEUE_TIMEOUT_MS", "5000"))
+MONGO_SERVER_SELECTION_TIMEOUT_MS = int(os.environ.get("MONGO_SERVER_SELECTION_TIMEOUT_MS", "5000"))
+MONGO_CONNECT_TIMEOUT_MS = int(os.environ.get("MONGO_CONNECT_TIMEOUT_MS", "5000"))
+MONGO_SOCKET_TIMEOUT_MS = int(os.environ.get("MONGO_SOCKET_TIMEOUT_MS", "20000"))
+
+# Health check thresholds: above either one the worker reports itself degraded
+HEALTH_PING_TIMEOUT = float(os.environ.get("HEALTH_PING_TIMEOUT", "2"))  # seconds
+HEALTH_MAX_LATENCY_MS = float(os.environ.get("HEALTH_MAX_LATENCY_MS", "500"))
+HEALTH_MAX_POOL_UTILIZATION = float(os.environ.get("HEALTH_MAX_POOL_UTILIZATION", "0.9"))
+
+
+class PoolMonitor(monitoring.ConnectionPoolListener):
+    """Counts open, checked-out and waiting connections across the client's pools.
+
+    Events arrive on Motor's executor threads, hence the lock.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.pools = 0
+        self.open = 0
+        self.in_use = 0
+        self.waiting = 0
+        self.checkout_failures = 0
+
+    def _add(self, **deltas):
+        with self._lock:
+            for name, delta in deltas.items():
+                setattr(self, name, getattr(self, name) + delta)
+
+    def pool_created(self, event):
+        self._add(pools=1)
+
+    def pool_ready(self, event):
+        pass
+
+    def pool_cleared(self, event):
+        pass
+
+    def pool_closed(self, event):
+        self._add(pools=-1)
+
+    def connection_created(self, event):
+        self._add(open=1)
+
+    def connection_ready(self, event):
+        pass
+
+    def connection_closed(self, event):
+        self._add(open=-1)
+
+    def connection_check_out_started(self, event):
+        self._add(waiting=1)
+
+    def connection_check_out_failed(self, event):
+        self._add(waiting=-1, checkout_failures=1)
+
+    def connection_checked_out(self, event):
+        self._add(waiting=-1, in_use=1)
+
+    def connection_checked_in(self, event):
+        self._add(in_use=-1)
+
+    def stats(self) -> dict:
+        with self._lock:
+            capacity = MONGO_MAX_POOL_SIZE * max(self.pools, 1)
+            return {
+                "maxSize": capacity,
+                "open": self.open,
+                "inUse": self.in_use,
+                "waiting": self.waiting,
+                "checkoutFailures": self.checkout_failures,
+                "utilization": round(self.in_use / capacity, 4),
+            }
+
+
+pool_monitor = PoolMonitor()
+
+registry.register(Gauge(
+    "mongodb_pool_connections_open", "Open MongoDB connections.", callback=lambda: pool_monitor.open
+))
+registry.register(Gauge(
+    "mongodb_pool_connections_in_use", "MongoDB connections checked out.", callback=lambda: pool_monitor.in_use
+))
+registry.register(Gauge(
+    "mongodb_pool_waiting", "Requests waiting for a MongoDB connection.", callback=lambda: pool_monitor.waiting
+))
+
+
+def create_client(mongo_url: str) -> AsyncIOMotorClient:
+    # No I/O happens here; connections are opened on first use
+    return AsyncIOMotorClient(
+        mongo_url,
+        maxPoolSize=MONGO_MAX_POOL_SIZE,
+        minPoolSize=MONGO_MIN_POOL_SIZE,
+        maxIdleTimeMS=MONGO_MAX_IDLE_TIME_MS,
+        waitQueueTimeoutMS=MONGO_WAIT_QUEUE_TIMEOUT_MS,
+        serverSelectionTimeoutMS=MONGO_SERVER_SELECTION_TIMEOUT_MS,
+        connectTimeoutMS=MONGO_CONNECT_TIMEOUT_MS,
+        socketTimeoutMS=MONGO_SOCKET_TIMEOUT_MS,
+        event_listeners=[pool_monitor, command_metrics, command_recorder],
+    )
+
+
+async def check_database(db) -> dict:
+    """Ping the database and report latency and pool usage.
+
+    `status` is "connected", "degraded" (slow ping or saturated pool) or "unreachable".
+    """
+    pool = pool_monitor.stats()
+    start = time.perf_counter()
+    try:
+        await asyncio.wait_for(db.command("ping"), HEALTH_PING_TIMEOUT)
+    except (PyMongoError, asyncio.TimeoutError) as exc:
+        return {"status": "unreachable", "error": type(exc).__name__, "pool": pool}
+    latency_ms = round((time.perf_counter() - start) * 1000, 2)
+
+    degraded = latency_ms > HEALTH_MAX_LATENCY_MS or pool["utilization"] >= HEALTH_MAX_POOL_UTILIZATION
+    return {"status": "degraded" if degraded else "connected", "latencyMs": latency_ms, "pool": pool}
@@ -0,0 +1,185 @@
+"""
+Derivative images (width buckets, WebP/AVIF variants) for files in the uploads directory.
+
+Run `python images.py` to backfill derivatives for existing uploads and attach
+`imageSrcset` to the products, services and blog posts that use them.
+"""
+import asyncio
+import logging
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from pathlib import Path
+
+logger = logging.getLogger(__name__)
+
+ROOT_DIR = Path(__file__).parent
+UPLOADS_DIR = ROOT_DIR / "uploads"
+UPLOADS_URL = "/api/uploads"
+DERIVED_DIR_NAME = "derived"
+
+IMAGE_WIDTHS = tuple(int(w) for w in os.environ.get("IMAGE_WIDTHS", "320,640,1280").split(","))
+# Modern formats generated next to the resized original-format copy
+IMAGE_FORMATS = tuple(f.strip() for f in os.environ.get("IMAGE_FORMATS", "webp").split(",") if f.strip())
+IMAGE_WORKERS = int(os.environ.get("IMAGE_WORKERS", "2"))
+
+FORMAT_MIME_TYPES = {
+    ".jpg": "image/jpeg",
+    ".png": "image/png",
+    ".webp": "image/webp",
+    ".avif": "image/avif",
+}
+SOURCE_SUFFIXES = (".jpg", ".jpeg", ".png", ".webp")
+
+_pool: ProcessPoolExecutor | None = None
+
+
+def derived_path(source: Path, width: int, suffix: str) -> Path:
+    relative = source.relative_to(UPLOADS_DIR)
+    return UPLOADS_DIR / DERIVED_DIR_NAME / relative.parent / f"{relative.stem}-{width}{suffix}"
+
+
+def _bucket_widths(source_width: int, widths: tuple[int, ...]) -> list[int]:
+    # Never upscale; an image narrower than every bucket gets one copy at its own width
+    buckets = [w for w in sorted(widths) if w < source_width]
+    if len(buckets) < len(widths):
+        buckets.append(source_width)
+    return buckets
+
+
+def generate_derivatives(source: str, widths: tuple[int, ...], formats: tuple[str, ...]) -> dict[str, list]:
+    """Write resized variants of `source`; runs inside a worker process.
+
+    Returns {suffix: [(width, path), ...]} for every format written.
+    """
+    from PIL import Image, ImageOps, features
+
+    source_path = Path(source)
+    original_suffix = ".jpg" if source_path.suffix.lower() in (".jpg", ".jpeg") else source_path.suffix.lower()
+    suffixes = [original_suffix] + [f".{fmt}" for fmt in formats if features.check(fmt)]
+    variants = {suffix: [] for suffix in dict.fromkeys(suffixes)}
+
+    with Image.open(source_path) as image:
+        image = ImageOps.exif_transpose(image)
+        if image.mode in ("P", "LA", "PA"):
+            image = image.convert("RGBA")
+        for width in _bucket_widths(image.width, widths):
+            height = max(1, round(image.height * width / image.width))
+            resized = image.resize((width, height), Image.Resampling.LANCZOS)
+            for suffix in variants:
+                target = derived_path(source_path, width, suffix)
+                target.parent.mkdir(parents=True, exist_ok=True)
+                frame = resized
+                if suffix == ".jpg" and frame.mode not in ("RGB", "L"):
+                    frame = frame.convert("RGB")
+                frame.save(target, quality=80, optimize=suffix in (".jpg", ".png"))
+                variants[suffix].append((width, str(target)))
+    return variants
+
+
+def build_srcset(variants: dict[str, list]) -> dict[str, str]:
+    """Map MIME type -> srcset string, ready for <picture><source type srcSet>."""
+    srcset = {}
+    for suffix, items in variants.items():
+        candidates = [
+            f"{UPLOADS_URL}/{Path(path).relative_to(UPLOADS_DIR).as_posix()} {width}w"
+            for width, path in items
+        ]
+        if candidates:
+            srcset[FORMAT_MIME_TYPES[suffix]] = ", ".join(candidates)
+    return srcset
+
+
+def get_pool() -> ProcessPoolExecutor:
+    global _pool
+    if _pool is None:
+        # Workers must not fork from a server that already runs Motor and anyio threads
+        method = "forkserver" if "forkserver" in multiprocessing.get_all_start_methods() else "spawn"
+        _pool = ProcessPoolExecutor(max_workers=IMAGE_WORKERS, mp_context=multiprocessing.get_context(method))
+    return _pool
+
+
+def _discard_pool(pool: ProcessPoolExecutor) -> None:
+    # A worker died (crash, OOM kill): the executor stays broken, so the next call starts a new one
+    global _pool
+    if _pool is pool:
+        _pool = None
+    pool.shutdown(wait=False, cancel_futures=True)
+
+
+def shutdown_pool() -> None:
+    global _pool
+    if _pool is not None:
+        _pool.shutdown(wait=False, cancel_futures=True)
+        _pool = None
+
+
+async def create_derivatives(source: Path) -> dict[str, str]:
+    """Generate derivatives in the process pool and return their srcset map.
+
+    Unsupported or broken images get an empty map; the original stays usable.
+    """
+    if source.suffix.lower() not in SOURCE_SUFFIXES:
+        return {}
+    loop = asyncio.get_running_loop()
+    pool = get_pool()
+    try:
+        variants = await loop.run_in_executor(
+            pool, generate_derivatives, str(source), IMAGE_WIDTHS, IMAGE_FORMATS
+        )
+    except BrokenProcessPool:
+        logger.exception("Image worker pool broke while processing %s; restarting it", source)
+        _discard_pool(pool)
+        return {}
+    except Exception:
+        logger.exception("Failed to generate derivatives for %s", source)
+        return {}
+    return build_srcset(variants)
+
+
+def iter_source_images():
+    for path in sorted(UPLOADS_DIR.rglob("*")):
+        relative = path.relative_to(UPLOADS_DIR)
+        if relative.parts[0] == DERIVED_DIR_NAME or relative.name.startswith("."):
+            continue
+        if path.is_file() and path.suffix.lower() in SOURCE_SUFFIXES:
+            yield path
+
+
+async def backfill():
+    from motor.motor_asyncio import AsyncIOMotorClient
+    from dotenv import load_dotenv
+
+    load_dotenv(ROOT_DIR / '.env')
+    client = AsyncIOMotorClient(os.environ['MONGO_URL'])
+    db = client[os.environ['DB_NAME']]
+
+    print("Generazione immagini derivate...")
+    sources = list(iter_source_images())
+    results = await asyncio.gather(*(create_derivatives(source) for source in sources))
+    srcsets = {}
+    for source, srcset in zip(sources, results):
+        if srcset:
+            relative = source.relative_to(UPLOADS_DIR).as_posix()
+            srcsets[f"{UPLOADS_URL}/{relative}"] = srcset
+            print(f"  ✓ {relative}")
+
+    print("\nAggiornamento imageSrcset nel database...")
+    for collection in ("products", "services", "blog_posts"):
+        updated = 0
+        async for doc in db[collection].find({"image": {"$regex": UPLOADS_URL}}, {"_id": 0, "id": 1, "image": 1}):
+            for url, srcset in srcsets.items():
+                if doc["image"].endswith(url):
+                    await db[collection].update_one({"id": doc["id"]}, {"$set": {"imageSrcset": srcset}})
+                    updated += 1
+                    break
+        print(f"  {collection}: {updated} documenti aggiornati")
+
+    shutdown_pool()
+    client.close()
+    print("\n✅ Backfill completato!")
+
+
+if __name__ == "__main__":
+    asyncio.run(backfill())
@@ -0,0 +1,101 @@
+import logging
+import time
+
+from pymongo import ASCENDING, DESCENDING, TEXT, IndexModel
+from pymongo.errors import OperationFailure
+
+logger = logging.getLogger(__name__)
+
+
+def _unique_id():
+    return IndexModel([("id", ASCENDING)], unique=True, name="id_unique")
+
+
+def _newest_first(filter_field="status"):
+    # (createdAt, id) keeps keyset pagination on an index, with and without the filter
+    return [
+        IndexModel(
+            [(filter_field, ASCENDING), ("createdAt", DESCENDING), ("id", DESCENDING)],
+            name=f"{filter_field}_createdAt_id",
+        ),
+        IndexModel([("createdAt", DESCENDING), ("id", DESCENDING)], name="createdAt_id"),
+    ]
+
+
+def _text(weights: dict[str, int]):
+    # One text index per collection; Italian stemming, case and diacritics folded (v3)
+    return IndexModel(
+        [(field, TEXT) for field in weights],
+        weights=weights,
+        default_language="italian",
+        language_override="textLanguage",
+        name="text_search",
+    )
+
+
+# One entry per query shape issued by server.py
+INDEXES = {
+    "products": [
+        _unique_id(),
+        IndexModel([("featured", ASCENDING)], name="featured"),
+        # Category browsing with the sorts offered by GET /products (see catalog.PRODUCT_SORTS)
+        *_newest_first("category"),
+        IndexModel([("category", ASCENDING), ("price", ASCENDING), ("id", ASCENDING)], name="category_price_id"),
+        IndexModel([("price", ASCENDING), ("id", ASCENDING)], name="price_id"),
+        _text({"name": 10, "benefits": 4, "ingredients": 4, "description": 2}),
+    ],
+    "services": [
+        _unique_id(),
+    ],
+    "orders": [
+        _unique_id(),
+        *_newest_first(),
+    ],
+    "bookings": [
+        _unique_id(),
+        IndexModel([("date", ASCENDING), ("time", ASCENDING), ("status", ASCENDING)], name="date_time_status"),
+        # At most one active booking per slot: inserting a booking is the reservation
+        IndexModel(
+            [("date", ASCENDING), ("time", ASCENDING)],
+            unique=True,
+            partialFilterExpression={"slotHeld": True},
+            name="slot_held_unique",
+        ),
+        IndexModel([("date", ASCENDING), ("id", ASCENDING)], name="date_id"),
+        IndexModel([("status", ASCENDING), ("date", ASCENDING), ("id", ASCENDING)], name="status_date_id"),
+    ],
+    "blog_posts": [
+        _unique_id(),
+        *_newest_first("published"),
+        _text({"title": 10, "excerpt": 5, "content": 1}),
+    ],
+    "contact_messages": [
+        _unique_id(),
+        *_newest_first(),
+    ],
+}
+
+
+async def ensure_indexes(db):
+    """Create any declared index that is missing, logging how long each build took.
+
+    A unique index that fails to build aborts startup; other failures are only logged.
+    """
+    for collection_name, indexes in INDEXES.items():
+        collection = db[collection_name]
+        existing = await collection.index_information()
+        for index in indexes:
+            name = index.document["name"]
+            if name in existing:
+                continue
+            start = time.perf_counter()
+            try:
+                await collection.create_indexes([index])
+            except OperationFailure as exc:
+                logger.error("Failed to build index %s.%s: %s", collection_name, name, exc)
+                # Unique indexes enforce invariants (one active booking per slot); don't serve without them
+                if index.document.get("unique"):
+                    raise
+                continue
+            elapsed_ms = (time.perf_counter() - start) * 1000
+            logger.info("Built index %s.%s in %.1f ms", collection_name, name, elapsed_ms)
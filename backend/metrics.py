@@ -0,0 +1,250 @@
+"""
+Prometheus metrics in the text exposition format, without extra dependencies.
+
+- MetricsMiddleware: per-route request counts, latency and response size histograms, in-flight gauge
+- CommandMetrics: per-collection MongoDB command time, fed by Motor command monitoring
+Query p99 per handler with e.g.
+  histogram_quantile(0.99, sum by (le, route) (rate(http_request_duration_seconds_bucket[5m])))
+"""
+import threading
+import time
+from bisect import bisect_left
+from typing import Callable, Iterable, Optional
+
+from pymongo import monitoring
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+DB_LATENCY_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0)
+SIZE_BUCKETS = (256, 1024, 4096, 16384, 65536, 262144, 1048576, 4194304)
+
+# Paths no route matched share one label, so scanners can't blow up the series count
+UNMATCHED_ROUTE = "unmatched"
+
+
+def _escape(value: str) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _labels(names: tuple[str, ...], values: tuple, extra: str = "") -> str:
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _number(value: float) -> str:
+    return str(int(value)) if float(value).is_integer() else repr(float(value))
+
+
+class Metric:
+    kind = "untyped"
+
+    def __init__(self, name: str, help_text: str, labels: tuple[str, ...] = ()):
+        self.name = name
+        self.help = help_text
+        self.label_names = labels
+        self._lock = threading.Lock()
+
+    def render(self) -> Iterable[str]:
+        yield f"# HELP {self.name} {self.help}"
+        yield f"# TYPE {self.name} {self.kind}"
+
+
+class Counter(Metric):
+    kind = "counter"
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._values: dict[tuple, float] = {}
+
+    def inc(self, *labels, amount: float = 1) -> None:
+        with self._lock:
+            self._values[labels] = self._values.get(labels, 0) + amount
+
+    def render(self) -> Iterable[str]:
+        yield from super().render()
+        with self._lock:
+            values = sorted(self._values.items())
+        for labels, value in values:
+            yield f"{self.name}{_labels(self.label_names, labels)} {_number(value)}"
+
+
+class Gauge(Metric):
+    """Gauge that is either set directly or read from `callback` at scrape time."""
+
+    kind = "gauge"
+
+    def __init__(self, *args, callback: Optional[Callable[[], float]] = None, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.callback = callback
+        self.value = 0.0
+
+    def inc(self, amount: float = 1) -> None:
+        with self._lock:
+            self.value += amount
+
+    def dec(self, amount: float = 1) -> None:
+        self.inc(-amount)
+
+    def render(self) -> Iterable[str]:
+        yield from super().render()
+        yield f"{self.name} {_number(self.callback() if self.callback else self.value)}"
+
+
+class Histogram(Metric):
+    kind = "histogram"
+
+    def __init__(self, *args, buckets: tuple[float, ...] = LATENCY_BUCKETS, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.buckets = tuple(sorted(buckets))
+        # labels -> [per-bucket counts..., +Inf count], sum
+        self._series: dict[tuple, tuple[list[int], list[float]]] = {}
+
+    def observe(self, value: float, *labels) -> None:
+        index = bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._series.get(labels)
+            if series is None:
+                series = self._series[labels] = ([0] * (len(self.buckets) + 1), [0.0])
+            series[0][index] += 1
+            series[1][0] += value
+
+    def render(self) -> Iterable[str]:
+        yield from super().render()
+        with self._lock:
+            series = sorted((labels, list(counts), total[0]) for labels, (counts, total) in self._series.items())
+        for labels, counts, total in series:
+            cumulative = 0
+            for bound, count in zip((*self.buckets, "+Inf"), counts):
+                cumulative += count
+                le = f'le="{bound if bound == "+Inf" else _number(bound)}"'
+                yield f"{self.name}_bucket{_labels(self.label_names, labels, le)} {cumulative}"
+            yield f"{self.name}_sum{_labels(self.label_names, labels)} {_number(total)}"
+            yield f"{self.name}_count{_labels(self.label_names, labels)} {cumulative}"
+
+
+class Registry:
+    def __init__(self):
+        self.metrics: list[Metric] = []
+
+    def register(self, metric: Metric) -> Metric:
+        self.metrics.append(metric)
+        return metric
+
+    def render(self) -> str:
+        return "\n".join(line for metric in self.metrics for line in metric.render()) + "\n"
+
+
+registry = Registry()
+
+http_requests_total = registry.register(Counter(
+    "http_requests_total", "HTTP requests handled.", ("method", "route", "status")
+))
+http_request_duration_seconds = registry.register(Histogram(
+    "http_request_duration_seconds", "HTTP request latency in seconds.", ("method", "route")
+))
+http_response_size_bytes = registry.register(Histogram(
+    "http_response_size_bytes", "HTTP response body size in bytes.", ("method", "route"), buckets=SIZE_BUCKETS
+))
+http_requests_in_flight = registry.register(Gauge(
+    "http_requests_in_flight", "HTTP requests currently being handled."
+))
+mongodb_command_duration_seconds = registry.register(Histogram(
+    "mongodb_command_duration_seconds", "MongoDB command time in seconds.", ("collection", "command"),
+    buckets=DB_LATENCY_BUCKETS
+))
+mongodb_command_failures_total = registry.register(Counter(
+    "mongodb_command_failures_total", "MongoDB commands that failed.", ("collection", "command")
+))
+
+
+def route_label(scope: Scope) -> str:
+    # The router writes its match into the shared scope: the path template, not the raw URL
+    route = scope.get("route")
+    if route is not None:
+        return route.path
+    if "endpoint" in scope and scope.get("root_path"):
+        # A Mount (e.g. /api/uploads) matched; label it by its prefix
+        return scope["root_path"]
+    return UNMATCHED_ROUTE
+
+
+class MetricsMiddleware:
+    """Pure ASGI middleware, so streaming and file responses are measured without buffering."""
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        status = 500
+        content_length = None
+        body_bytes = 0
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal status, content_length, body_bytes
+            if message["type"] == "http.response.start":
+                status = message["status"]
+                for name, value in message.get("headers", []):
+                    if name.lower() == b"content-length":
+                        content_length = int(value)
+            elif message["type"] == "http.response.body":
+                body_bytes += len(message.get("body", b""))
+            await send(message)
+
+        http_requests_in_flight.inc()
+        start = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            elapsed = time.perf_counter() - start
+            http_requests_in_flight.dec()
+            method, route = scope["method"], route_label(scope)
+            http_requests_total.inc(method, route, str(status))
+            http_request_duration_seconds.observe(elapsed, method, route)
+            size = content_length if content_length is not None else body_bytes
+            http_response_size_bytes.observe(size, method, route)
+
+
+def command_collection(event) -> Optional[str]:
+    """Collection a command runs against; getMore carries the cursor id under its own name."""
+    key = "collection" if event.command_name == "getMore" else event.command_name
+    target = event.command.get(key)
+    return target if isinstance(target, str) else None
+
+
+class CommandMetrics(monitoring.CommandListener):
+    """Times every MongoDB command per collection.
+
+    Events arrive on Motor's executor threads; started/finished events are
+    paired by (connection, request id).
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._pending: dict[tuple, str] = {}
+
+    def started(self, event):
+        collection = command_collection(event) or event.database_name
+        with self._lock:
+            self._pending[(event.connection_id, event.request_id)] = collection
+
+    def _finish(self, event) -> str:
+        with self._lock:
+            return self._pending.pop((event.connection_id, event.request_id), event.database_name)
+
+    def succeeded(self, event):
+        collection = self._finish(event)
+        mongodb_command_duration_seconds.observe(event.duration_micros / 1e6, collection, event.command_name)
+
+    def failed(self, event):
+        collection = self._finish(event)
+        mongodb_command_duration_seconds.observe(event.duration_micros / 1e6, collection, event.command_name)
+        mongodb_command_failures_total.inc(collection, event.command_name)
+
+
+command_metrics = CommandMetrics()
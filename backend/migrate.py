@@ -0,0 +1,129 @@
+"""
+Versioned, idempotent data migrations.
+
+Applied versions are recorded in the `migrations` collection, so re-running
+`python migrate.py` only runs what is new (`--status` lists them without
+applying anything). Migrations write with one bulk_write per collection and
+filter on indexed fields; they never delete live documents.
+"""
+import asyncio
+import os
+import sys
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Awaitable, Callable, NamedTuple
+
+from pymongo import UpdateOne
+
+ROOT_DIR = Path(__file__).parent
+
+
+class Migration(NamedTuple):
+    version: str
+    description: str
+    apply: Callable[..., Awaitable[dict]]
+
+
+async def _bulk_upsert(collection, updates: dict[str, dict], now: datetime, insert_only: bool) -> dict:
+    """Upsert documents keyed by `id`; `insert_only` leaves existing ones untouched."""
+    operator = "$setOnInsert" if insert_only else "$set"
+    requests = []
+    for doc_id, fields in updates.items():
+        update = {operator: {k: v for k, v in fields.items() if k != "id"}}
+        if insert_only:
+            update[operator]["createdAt"] = now
+            update[operator]["updatedAt"] = now
+        else:
+            update["$set"]["updatedAt"] = now
+        requests.append(UpdateOne({"id": doc_id}, update, upsert=insert_only))
+    if not requests:
+        return {"inserted": 0, "modified": 0}
+    result = await collection.bulk_write(requests, ordered=False)
+    return {"inserted": result.upserted_count, "modified": result.modified_count}
+
+
+async def seed_catalog(db, now: datetime) -> dict:
+    from seed_db import PRODUCTS, SERVICES, BLOG_POSTS
+
+    report = {}
+    for name, documents in (("products", PRODUCTS), ("services", SERVICES), ("blog_posts", BLOG_POSTS)):
+        report[name] = await _bulk_upsert(db[name], {doc["id"]: doc for doc in documents}, now, insert_only=True)
+    return report
+
+
+async def scraped_images(db, now: datetime) -> dict:
+    from update_images import PRODUCT_IMAGES, SERVICE_IMAGES, BLOG_IMAGES
+
+    report = {}
+    for name, updates in (("products", PRODUCT_IMAGES), ("services", SERVICE_IMAGES), ("blog_posts", BLOG_IMAGES)):
+        report[name] = await _bulk_upsert(db[name], updates, now, insert_only=False)
+    return report
+
+
+async def backfill_timestamps(db, now: datetime) -> dict:
+    # Documents created before createdAt was stored; newest-first pagination needs it
+    report = {}
+    for name in ("products", "services", "blog_posts"):
+        result = await db[name].update_many(
+            {"createdAt": {"$exists": False}},
+            [{"$set": {"createdAt": now, "updatedAt": {"$ifNull": ["$updatedAt", now]}}}]
+        )
+        report[name] = {"modified": result.modified_count}
+    return report
+
+
+MIGRATIONS = [
+    Migration("0001_seed_catalog", "Seed products, services and blog posts", seed_catalog),
+    Migration("0002_scraped_images", "Original centrometis.com images", scraped_images),
+    Migration("0003_catalog_timestamps", "Backfill createdAt/updatedAt on catalog documents", backfill_timestamps),
+]
+
+
+async def applied_versions(db) -> set[str]:
+    return {doc["_id"] async for doc in db.migrations.find({}, {"_id": 1})}
+
+
+async def run_migrations(db, migrations: list[Migration] = MIGRATIONS) -> list[tuple[Migration, dict]]:
+    """Apply pending migrations in order and record each one once it succeeds."""
+    applied = await applied_versions(db)
+    results = []
+    for migration in migrations:
+        if migration.version in applied:
+            continue
+        started = time.perf_counter()
+        now = datetime.utcnow()
+        report = await migration.apply(db, now)
+        await db.migrations.insert_one({
+            "_id": migration.version,
+            "description": migration.description,
+            "appliedAt": now,
+            "durationMs": round((time.perf_counter() - started) * 1000, 1),
+            "report": report,
+        })
+        results.append((migration, report))
+    return results
+
+
+async def main(argv: list[str]):
+    from motor.motor_asyncio import AsyncIOMotorClient
+    from dotenv import load_dotenv
+
+    load_dotenv(ROOT_DIR / '.env')
+    client = AsyncIOMotorClient(os.environ['MONGO_URL'])
+    db = client[os.environ['DB_NAME']]
+
+    if "--status" in argv:
+        applied = await applied_versions(db)
+        for migration in MIGRATIONS:
+            print(f"  {'✓' if migration.version in applied else '·'} {migration.version}  {migration.description}")
+    else:
+        results = await run_migrations(db)
+        for migration, report in results:
+            print(f"  ✓ {migration.version}: {report}")
+        print(f"\n✅ {len(results)} migrazioni applicate" if results else "✅ Database già aggiornato")
+    client.close()
+
+
+if __name__ == "__main__":
+    asyncio.run(main(sys.argv[1:]))
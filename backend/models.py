@@ -1,5 +1,5 @@
 from pydantic import BaseModel, Field
-from typing import List, Optional, Any
+from typing import Dict, List, Optional, Any
 from datetime import datetime
 import uuid
 
@@ -16,6 +16,7 @@ class Product(BaseModel):
     category: str
     price: float
     image: str
+    imageSrcset: Optional[Dict[str, str]] = None  # MIME type -> srcset of derived sizes
     description: str
     inStock: bool = True
     featured: bool = False
@@ -38,11 +39,30 @@ class Product(BaseModel):
     updatedAt: datetime = Field(default_factory=datetime.utcnow)
 
 
+class ProductCard(BaseModel):
+    """Compact product for list views (no long texts or nutritional table)."""
+    id: str
+    name: str
+    subtitle: Optional[str] = None
+    category: str
+    price: float
+    image: str
+    imageSrcset: Optional[Dict[str, str]] = None
+    description: str
+    inStock: bool = True
+    featured: bool = False
+    brand: Optional[str] = "Metis"
+    flavor: Optional[str] = None
+    glutenFree: Optional[bool] = False
+    lactoseFree: Optional[bool] = False
+
+
 class ProductCreate(BaseModel):
     name: str
     category: str
     price: float
     image: str
+    imageSrcset: Optional[Dict[str, str]] = None
     description: str
     inStock: bool = True
     featured: bool = False
@@ -67,6 +87,7 @@ class ProductUpdate(BaseModel):
     category: Optional[str] = None
     price: Optional[float] = None
     image: Optional[str] = None
+    imageSrcset: Optional[Dict[str, str]] = None
     description: Optional[str] = None
     inStock: Optional[bool] = None
     featured: Optional[bool] = None
@@ -94,6 +115,7 @@ class Service(BaseModel):
     duration: Optional[str] = None
     description: str
     image: str
+    imageSrcset: Optional[Dict[str, str]] = None
     createdAt: datetime = Field(default_factory=datetime.utcnow)
     updatedAt: datetime = Field(default_factory=datetime.utcnow)
 
@@ -105,6 +127,7 @@ class ServiceCreate(BaseModel):
     duration: Optional[str] = None
     description: str
     image: str
+    imageSrcset: Optional[Dict[str, str]] = None
 
 
 class ServiceUpdate(BaseModel):
@@ -114,6 +137,7 @@ class ServiceUpdate(BaseModel):
     duration: Optional[str] = None
     description: Optional[str] = None
     image: Optional[str] = None
+    imageSrcset: Optional[Dict[str, str]] = None
 
 
 class OrderItem(BaseModel):
@@ -202,12 +226,26 @@ class BlogPost(BaseModel):
     author: str
     date: str
     image: str
+    imageSrcset: Optional[Dict[str, str]] = None
     category: str
     published: bool = True
     createdAt: datetime = Field(default_factory=datetime.utcnow)
     updatedAt: datetime = Field(default_factory=datetime.utcnow)
 
 
+class BlogPostCard(BaseModel):
+    """Blog post without its content, for list views."""
+    id: str
+    title: str
+    excerpt: str
+    author: str
+    date: str
+    image: str
+    imageSrcset: Optional[Dict[str, str]] = None
+    category: str
+    published: bool = True
+
+
 class BlogPostCreate(BaseModel):
     title: str
     excerpt: str
@@ -215,6 +253,7 @@ class BlogPostCreate(BaseModel):
     author: str
     date: str
     image: str
+    imageSrcset: Optional[Dict[str, str]] = None
     category: str
     published: bool = True
 
@@ -226,6 +265,7 @@ class BlogPostUpdate(BaseModel):
     author: Optional[str] = None
     date: Optional[str] = None
     image: Optional[str] = None
+    imageSrcset: Optional[Dict[str, str]] = None
     category: Optional[str] = None
     published: Optional[bool] = None
 
@@ -0,0 +1,62 @@
+import base64
+import binascii
+from datetime import datetime
+from typing import Any, Optional
+
+import orjson
+from fastapi import HTTPException
+
+# Sort specs used with keyset pagination; the trailing `id` makes every position unique
+NEWEST_FIRST = [("createdAt", -1), ("id", -1)]
+BY_DATE = [("date", 1), ("id", 1)]
+
+
+def encode_cursor(values: list) -> str:
+    raw = [{"$date": v.isoformat()} if isinstance(v, datetime) else v for v in values]
+    return base64.urlsafe_b64encode(orjson.dumps(raw)).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> list:
+    try:
+        raw = orjson.loads(base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)))
+        if not isinstance(raw, list):
+            raise ValueError(cursor)
+        return [
+            datetime.fromisoformat(v["$date"]) if isinstance(v, dict) else v
+            for v in raw
+        ]
+    except (binascii.Error, orjson.JSONDecodeError, KeyError, TypeError, ValueError):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+
+def keyset_filter(sort: list[tuple[str, int]], values: list[Any]) -> dict:
+    """Range filter that seeks past the document the cursor points at."""
+    (first, direction), (second, _) = sort
+    if len(values) != 2:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+    op = "$lt" if direction < 0 else "$gt"
+    return {"$or": [
+        {first: {op: values[0]}},
+        {first: values[0], second: {op: values[1]}},
+    ]}
+
+
+async def fetch_page(
+    collection,
+    query: dict,
+    sort: list[tuple[str, int]],
+    cursor: str,
+    limit: int,
+    projection: Optional[dict] = None,
+) -> tuple[list[dict], Optional[str]]:
+    """Return one page of documents plus the cursor for the next page.
+
+    An empty `cursor` starts from the beginning.
+    """
+    if cursor:
+        query = {**query, **keyset_filter(sort, decode_cursor(cursor))}
+    docs = await collection.find(query, projection).sort(sort).limit(limit).to_list(limit)
+    next_cursor = None
+    if len(docs) == limit:
+        next_cursor = encode_cursor([docs[-1].get(field) for field, _ in sort])
+    return docs, next_cursor
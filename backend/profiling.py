@@ -0,0 +1,204 @@
+"""
+Opt-in request profiling (PROFILING_ENABLED=true).
+
+Requests slower than PROFILE_SLOW_MS, plus one in PROFILE_SAMPLE_EVERY, are saved
+with a cProfile report and the MongoDB commands they issued to a bounded ring
+buffer on disk (PROFILE_DIR, newest PROFILE_MAX_TRACES kept). Admins read them
+from /api/admin/profiles; the raw .prof opens in snakeviz or pstats.
+
+Python allows one active profiler per thread, so cProfile runs for one request
+at a time and also sees whatever other coroutines ran on the loop meanwhile.
+A slow request that overlapped a profiled one is still saved, without a profile.
+"""
+import cProfile
+import io
+import os
+import pstats
+import re
+import threading
+import time
+import uuid
+from contextvars import ContextVar
+from datetime import datetime
+from pathlib import Path
+from typing import Optional
+
+import orjson
+from pymongo import monitoring
+from starlette.concurrency import run_in_threadpool
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from metrics import command_collection, route_label
+
+PROFILING_ENABLED = os.environ.get("PROFILING_ENABLED", "false").lower() in ("1", "true", "yes")
+PROFILE_SLOW_MS = float(os.environ.get("PROFILE_SLOW_MS", "500"))
+PROFILE_SAMPLE_EVERY = int(os.environ.get("PROFILE_SAMPLE_EVERY", "0"))  # 0 = slow requests only
+PROFILE_DIR = Path(os.environ.get("PROFILE_DIR", str(Path(__file__).parent / "profiles")))
+PROFILE_MAX_TRACES = int(os.environ.get("PROFILE_MAX_TRACES", "50"))
+PROFILE_TOP_FUNCTIONS = 40
+
+# Never profile the endpoints used to read the profiles (or the scraper)
+PROFILE_SKIP_PREFIXES = ("/api/admin/profiles", "/metrics")
+
+TRACE_ID_RE = re.compile(r"\d{13}-[0-9a-f]{8}")
+
+# MongoDB commands of the request being traced; Motor copies the context into its executor threads
+current_commands: ContextVar[Optional[list]] = ContextVar("current_commands", default=None)
+
+
+class CommandRecorder(monitoring.CommandListener):
+    """Appends each MongoDB command and its duration to the current request's trace, if any."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._pending: dict[tuple, tuple[list, str]] = {}
+
+    def started(self, event):
+        commands = current_commands.get()
+        if commands is None:
+            return
+        collection = command_collection(event)
+        with self._lock:
+            self._pending[(event.connection_id, event.request_id)] = (commands, collection)
+
+    def _finish(self, event, failure: Optional[str] = None):
+        with self._lock:
+            pending = self._pending.pop((event.connection_id, event.request_id), None)
+        if pending is None:
+            return
+        commands, collection = pending
+        commands.append({
+            "command": event.command_name,
+            "collection": collection,
+            "durationMs": round(event.duration_micros / 1000, 3),
+            "failure": failure,
+        })
+
+    def succeeded(self, event):
+        self._finish(event)
+
+    def failed(self, event):
+        self._finish(event, failure=str(event.failure.get("errmsg", "error")))
+
+
+command_recorder = CommandRecorder()
+
+
+class ProfileStore:
+    """Ring buffer of traces: `<id>.json` plus an optional `<id>.prof`, oldest deleted first."""
+
+    def __init__(self, directory: Path = PROFILE_DIR, max_traces: int = PROFILE_MAX_TRACES):
+        self.directory = directory
+        self.max_traces = max_traces
+        self._lock = threading.Lock()
+
+    def save(self, trace: dict, profiler: Optional[cProfile.Profile]) -> str:
+        # Ids sort chronologically: milliseconds since the epoch, then a random suffix
+        trace_id = f"{int(time.time() * 1000):013d}-{uuid.uuid4().hex[:8]}"
+        self.directory.mkdir(parents=True, exist_ok=True)
+        trace = {"id": trace_id, **trace, "profile": None}
+        if profiler is not None:
+            report = io.StringIO()
+            pstats.Stats(profiler, stream=report).sort_stats("cumulative").print_stats(PROFILE_TOP_FUNCTIONS)
+            trace["profile"] = report.getvalue()
+            profiler.dump_stats(self.directory / f"{trace_id}.prof")
+
+        partial = self.directory / f".{trace_id}.json.part"
+        partial.write_bytes(orjson.dumps(trace))
+        os.replace(partial, self.directory / f"{trace_id}.json")
+        self.prune()
+        return trace_id
+
+    def prune(self) -> None:
+        with self._lock:
+            traces = sorted(self.directory.glob("*.json"))
+            for path in traces[:max(len(traces) - self.max_traces, 0)]:
+                path.unlink(missing_ok=True)
+                path.with_suffix(".prof").unlink(missing_ok=True)
+
+    def list(self) -> list[dict]:
+        """Newest first, without the profile text."""
+        summaries = []
+        for path in sorted(self.directory.glob("*.json"), reverse=True):
+            try:
+                trace = orjson.loads(path.read_bytes())
+            except (OSError, orjson.JSONDecodeError):
+                continue  # pruned or being written
+            commands = trace.pop("commands", [])
+            trace.pop("profile", None)
+            trace["commandCount"] = len(commands)
+            trace["dbMs"] = round(sum(c["durationMs"] for c in commands), 3)
+            summaries.append(trace)
+        return summaries
+
+    def get(self, trace_id: str) -> Optional[dict]:
+        if not TRACE_ID_RE.fullmatch(trace_id):
+            return None
+        path = self.directory / f"{trace_id}.json"
+        return orjson.loads(path.read_bytes()) if path.exists() else None
+
+    def prof_path(self, trace_id: str) -> Optional[Path]:
+        if not TRACE_ID_RE.fullmatch(trace_id):
+            return None
+        path = self.directory / f"{trace_id}.prof"
+        return path if path.exists() else None
+
+
+profile_store = ProfileStore()
+
+
+class ProfilingMiddleware:
+    def __init__(self, app: ASGIApp, store: ProfileStore = profile_store):
+        self.app = app
+        self.store = store
+        self.requests = 0
+        self.profiler_busy = False
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or scope["path"].startswith(PROFILE_SKIP_PREFIXES):
+            await self.app(scope, receive, send)
+            return
+
+        self.requests += 1
+        sampled = PROFILE_SAMPLE_EVERY > 0 and self.requests % PROFILE_SAMPLE_EVERY == 0
+        status = 500
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        profiler = None
+        if not self.profiler_busy:
+            self.profiler_busy = True
+            profiler = cProfile.Profile()
+            profiler.enable()
+        commands = []
+        token = current_commands.set(commands)
+        started_at = datetime.utcnow()
+        start = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            # Also reached when the app raises: status is then still 500 unless headers went out
+            duration_ms = (time.perf_counter() - start) * 1000
+            if profiler is not None:
+                profiler.disable()
+                self.profiler_busy = False
+            current_commands.reset(token)
+
+            reason = "slow" if duration_ms >= PROFILE_SLOW_MS else "sampled" if sampled else None
+            if reason is not None:
+                trace = {
+                    "reason": reason,
+                    "method": scope["method"],
+                    "path": scope["path"],
+                    "route": route_label(scope),
+                    "status": status,
+                    "durationMs": round(duration_ms, 3),
+                    "startedAt": started_at.isoformat(),
+                    "commands": commands,
+                }
+                # The response has been sent already; writing the trace only delays this task
+                await run_in_threadpool(self.store.save, trace, profiler)
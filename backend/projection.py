@@ -0,0 +1,33 @@
+from functools import lru_cache
+from typing import Optional, Type
+
+from fastapi import HTTPException
+from pydantic import BaseModel, create_model
+
+# Fetched even when not returned: Last-Modified and keyset cursors are built from them
+ALWAYS_PROJECTED = ("id", "createdAt", "updatedAt")
+LIST_VIEW_PATTERN = "^(card|full)$"
+
+
+@lru_cache(maxsize=256)
+def partial_model(model: Type[BaseModel], names: tuple[str, ...]) -> Type[BaseModel]:
+    """Subset of `model` with the same field types and defaults."""
+    return create_model(
+        f"{model.__name__}Fields",
+        **{name: (model.model_fields[name].annotation, model.model_fields[name]) for name in names}
+    )
+
+
+def response_model(model: Type[BaseModel], card: Type[BaseModel], view: str, fields: Optional[str]) -> Type[BaseModel]:
+    """Model for a list response: `fields=` wins over `view`, which defaults to the card."""
+    if fields:
+        names = {name.strip() for name in fields.split(",") if name.strip()}
+        unknown = names - set(model.model_fields)
+        if unknown:
+            raise HTTPException(status_code=400, detail=f"Unknown fields: {', '.join(sorted(unknown))}")
+        return partial_model(model, tuple(sorted(names | {"id"})))
+    return model if view == "full" else card
+
+
+def mongo_projection(model: Type[BaseModel]) -> dict:
+    return {"_id": 0, **{name: 1 for name in (*model.model_fields, *ALWAYS_PROJECTED)}}
@@ -0,0 +1,162 @@
+import logging
+import os
+import threading
+import time
+from contextlib import contextmanager
+from typing import Optional
+
+from fastapi import HTTPException
+from pydantic import BaseModel
+from pymongo import ReturnDocument
+
+from cache import TTLCache, catalog_cache
+from pagination import NEWEST_FIRST, fetch_page
+from responses import JSONPayload
+
+logger = logging.getLogger(__name__)
+
+# Operations slower than this are logged with their collection and query shape
+REPOSITORY_SLOW_MS = float(os.environ.get("REPOSITORY_SLOW_MS", "200"))
+
+class OperationTimings:
+    """Count / total / max duration per (collection, operation)."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._timings: dict[tuple[str, str], list[float]] = {}
+
+    def record(self, collection: str, operation: str, elapsed_ms: float) -> None:
+        with self._lock:
+            entry = self._timings.setdefault((collection, operation), [0, 0.0, 0.0])
+            entry[0] += 1
+            entry[1] += elapsed_ms
+            entry[2] = max(entry[2], elapsed_ms)
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                f"{collection}.{operation}": {
+                    "count": count,
+                    "avgMs": round(total / count, 3),
+                    "maxMs": round(slowest, 3),
+                }
+                for (collection, operation), (count, total, slowest) in sorted(self._timings.items())
+            }
+
+
+operation_timings = OperationTimings()
+
+
+class Repository:
+    """Async access to one collection for the CRUD endpoints.
+
+    Centralizes the `_id`-free projection, limit caps, 404s, catalog cache
+    invalidation and per-operation timing, so each endpoint only states its query.
+    Reads return raw documents: endpoints validate them with the model matching the
+    projection they asked for (card vs full views, status fields the models don't expose).
+    """
+
+    def __init__(
+        self,
+        db,
+        name: str,
+        not_found: str,
+        max_limit: int = 100,
+        sort: list[tuple[str, int]] = NEWEST_FIRST,
+        cache: Optional[TTLCache] = None,
+    ):
+        self.collection = db[name]
+        self.name = name
+        self.not_found = not_found
+        self.max_limit = max_limit
+        self.sort = sort
+        self.cache = cache
+
+    @contextmanager
+    def timed(self, operation: str, query: Optional[dict] = None):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed_ms = (time.perf_counter() - start) * 1000
+            operation_timings.record(self.name, operation, elapsed_ms)
+            if elapsed_ms > REPOSITORY_SLOW_MS:
+                logger.warning(
+                    "Slow %s on %s: %.1f ms (filter keys: %s)",
+                    operation, self.name, elapsed_ms, sorted(query or {})
+                )
+
+    def clamp(self, limit: int) -> int:
+        return max(1, min(limit, self.max_limit))
+
+    async def find(
+        self,
+        query: dict,
+        sort: Optional[list[tuple[str, int]]] = None,
+        skip: int = 0,
+        limit: int = 100,
+        projection: Optional[dict] = None,
+    ) -> list[dict]:
+        limit = self.clamp(limit)
+        with self.timed("find", query):
+            cursor = self.collection.find(query, projection or {'_id': 0})
+            if sort:
+                cursor = cursor.sort(sort)
+            return await cursor.skip(skip).limit(limit).to_list(limit)
+
+    async def page(
+        self, query: dict, cursor: str, limit: int, projection: Optional[dict] = None
+    ) -> tuple[list[dict], Optional[str]]:
+        """Keyset page in the repository's sort order, plus the cursor for the next one."""
+        with self.timed("page", query):
+            return await fetch_page(
+                self.collection, query, self.sort, cursor, self.clamp(limit), projection or {'_id': 0}
+            )
+
+    async def get(self, doc_id: str, projection: Optional[dict] = None) -> dict:
+        with self.timed("get"):
+            doc = await self.collection.find_one({"id": doc_id}, projection or {'_id': 0})
+        if doc is None:
+            raise HTTPException(status_code=404, detail=self.not_found)
+        return doc
+
+    async def insert(self, obj: BaseModel, **extra) -> BaseModel:
+        with self.timed("insert"):
+            await self.collection.insert_one({**obj.dict(), **extra})
+        self.invalidate()
+        return obj
+
+    async def update(self, doc_id: str, update: dict, return_document=ReturnDocument.AFTER) -> dict:
+        """Apply `update` and return the document in the same round trip.
+
+        Status endpoints ask for ReturnDocument.BEFORE: they need the old status for the stats counters.
+        """
+        with self.timed("update"):
+            doc = await self.collection.find_one_and_update(
+                {"id": doc_id}, update, projection={'_id': 0}, return_document=return_document
+            )
+        if doc is None:
+            raise HTTPException(status_code=404, detail=self.not_found)
+        self.invalidate()
+        return doc
+
+    async def delete(self, doc_id: str) -> None:
+        with self.timed("delete"):
+            result = await self.collection.delete_one({"id": doc_id})
+        if result.deleted_count == 0:
+            raise HTTPException(status_code=404, detail=self.not_found)
+        self.invalidate()
+
+    def invalidate(self) -> None:
+        if self.cache is not None:
+            self.cache.invalidate(self.name)
+
+    async def cached(self, key: tuple, load) -> JSONPayload:
+        """Serve `load()`'s encoded payload from the catalog cache when the repository has one."""
+        if self.cache is None:
+            return await load()
+        return await self.cache.get_or_load((self.name, *key), load)
+
+
+def catalog_repository(db, name: str, not_found: str, **options) -> Repository:
+    return Repository(db, name, not_found, cache=catalog_cache, **options)
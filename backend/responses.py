@@ -0,0 +1,75 @@
+import hashlib
+from datetime import datetime, timezone
+from email.utils import format_datetime, parsedate_to_datetime
+from typing import Any, NamedTuple, Optional
+
+import orjson
+from fastapi import Request, Response
+
+
+class JSONPayload(NamedTuple):
+    body: bytes
+    etag: str
+    last_modified: Optional[datetime] = None
+
+
+def encode_payload(data: Any, last_modified: Optional[datetime] = None) -> JSONPayload:
+    """Encode `data` once so it can be cached and served as raw bytes.
+
+    Lists leave `last_modified` unset: their newest `updatedAt` misses deletes and
+    filter changes, so they are revalidated by ETag only.
+    """
+    body = orjson.dumps(data)
+    etag = f'"{hashlib.sha256(body).hexdigest()[:32]}"'
+    return JSONPayload(body=body, etag=etag, last_modified=last_modified)
+
+
+def _http_date(value: datetime) -> str:
+    # Stored timestamps are naive UTC (datetime.utcnow)
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)
+    return format_datetime(value, usegmt=True)
+
+
+def _etag_matches(if_none_match: str, etag: str) -> bool:
+    if if_none_match.strip() == "*":
+        return True
+    # If-None-Match uses the weak comparison function
+    candidates = [tag.strip().removeprefix("W/") for tag in if_none_match.split(",")]
+    return etag in candidates
+
+
+def _not_modified_since(if_modified_since: str, last_modified: Optional[datetime]) -> bool:
+    if last_modified is None:
+        return False
+    try:
+        since = parsedate_to_datetime(if_modified_since)
+    except (TypeError, ValueError):
+        return False
+    if since.tzinfo is None:
+        since = since.replace(tzinfo=timezone.utc)
+    if last_modified.tzinfo is None:
+        last_modified = last_modified.replace(tzinfo=timezone.utc)
+    # HTTP dates only have second precision
+    return last_modified.replace(microsecond=0) <= since
+
+
+def payload_response(payload: JSONPayload, request: Optional[Request] = None) -> Response:
+    """Serve a cached payload, answering conditional requests with 304."""
+    headers = {"ETag": payload.etag, "Cache-Control": "no-cache"}
+    if payload.last_modified is not None:
+        headers["Last-Modified"] = _http_date(payload.last_modified)
+
+    if request is not None:
+        if_none_match = request.headers.get("if-none-match")
+        if_modified_since = request.headers.get("if-modified-since")
+        if if_none_match is not None:
+            not_modified = _etag_matches(if_none_match, payload.etag)
+        elif if_modified_since is not None:
+            not_modified = _not_modified_since(if_modified_since, payload.last_modified)
+        else:
+            not_modified = False
+        if not_modified:
+            return Response(status_code=304, headers=headers)
+
+    return Response(content=payload.body, media_type="application/json", headers=headers)
@@ -0,0 +1,65 @@
+import asyncio
+from typing import NamedTuple, Type
+
+from pydantic import BaseModel
+
+from models import Product, BlogPost
+
+SEARCH_MIN_LENGTH = 2
+SEARCH_MAX_LIMIT = 50
+# Deep pages cost skip + limit documents per collection; stop well before that hurts
+SEARCH_MAX_SKIP = 1000
+
+# Text indexes behind $text (see indexes.py): Italian stemming, diacritics folded
+SEARCH_LANGUAGE = "italian"
+
+
+class SearchTarget(NamedTuple):
+    collection: str
+    filter: dict
+    model: Type[BaseModel]
+
+
+SEARCH_TARGETS = {
+    "products": SearchTarget("products", {}, Product),
+    "blog": SearchTarget("blog_posts", {"published": True}, BlogPost),
+}
+
+
+async def _search_collection(db, target: SearchTarget, text: str, limit: int) -> tuple[list[dict], int]:
+    query = {"$text": {"$search": text, "$language": SEARCH_LANGUAGE}, **target.filter}
+    score = {"$meta": "textScore"}
+    docs, total = await asyncio.gather(
+        db[target.collection].find(query, {"_id": 0, "score": score}).sort([("score", score)]).to_list(limit),
+        db[target.collection].count_documents(query),
+    )
+    return docs, total
+
+
+async def search_catalog(db, text: str, types: list[str], skip: int = 0, limit: int = 20) -> dict:
+    """Rank products and blog posts matching `text` by text score, across collections.
+
+    Each collection returns its best `skip + limit` hits concurrently; they are
+    merged by score and the requested page is cut from the merged list.
+    """
+    targets = [SEARCH_TARGETS[name] for name in types]
+    results = await asyncio.gather(*(_search_collection(db, target, text, skip + limit) for target in targets))
+
+    hits = []
+    for name, (docs, _) in zip(types, results):
+        for doc in docs:
+            score = doc.pop("score")
+            hits.append((score, name, doc))
+    hits.sort(key=lambda hit: hit[0], reverse=True)
+
+    total = sum(count for _, count in results)
+    items = [
+        {"type": name, "score": round(score, 4), "item": SEARCH_TARGETS[name].model(**doc).dict()}
+        for score, name, doc in hits[skip:skip + limit]
+    ]
+    return {
+        "query": text,
+        "total": total,
+        "items": items,
+        "nextSkip": skip + limit if skip + limit < total else None,
+    }
@@ -1,38 +1,85 @@
-from fastapi import FastAPI, APIRouter, HTTPException, Depends, UploadFile, File
-from fastapi.staticfiles import StaticFiles
+from fastapi import FastAPI, APIRouter, HTTPException, Depends, UploadFile, File, Request, Query
 from dotenv import load_dotenv
+from fastapi.responses import FileResponse, JSONResponse, PlainTextResponse, StreamingResponse
 from starlette.middleware.cors import CORSMiddleware
-from motor.motor_asyncio import AsyncIOMotorClient
+from starlette.concurrency import run_in_threadpool
+from pymongo import ReturnDocument
+from pymongo.errors import DuplicateKeyError
+import asyncio
 import os
 import logging
+from contextlib import asynccontextmanager
 from pathlib import Path
-from datetime import datetime, timedelta
-import uuid
-import shutil
+from datetime import datetime, timedelta, date as date_type
 from models import (
-    Product, ProductCreate, ProductUpdate,
+    Product, ProductCard, ProductCreate, ProductUpdate,
     Service, ServiceCreate, ServiceUpdate,
     Order, OrderCreate, OrderStatusUpdate,
     Booking, BookingCreate, BookingStatusUpdate,
-    BlogPost, BlogPostCreate, BlogPostUpdate,
+    BlogPost, BlogPostCard, BlogPostCreate, BlogPostUpdate,
     ContactMessage, ContactMessageCreate, ContactMessageStatusUpdate
 )
 from auth import (
     Token, AdminLogin, AdminUser, 
     authenticate_admin, create_access_token, get_current_admin,
+    check_login_rate, login_rate_key, login_rate_limiter, proxy_headers_trusted,
     ACCESS_TOKEN_EXPIRE_MINUTES
 )
+from database import create_client, check_database
+from metrics import MetricsMiddleware, registry as metrics_registry
+from profiling import PROFILING_ENABLED, ProfilingMiddleware, profile_store
+from cache import catalog_cache
+from responses import encode_payload, payload_response
+from indexes import ensure_indexes
+from pagination import BY_DATE
+from repository import Repository, catalog_repository, operation_timings
+from uploads import UploadSizeLimitMiddleware, save_upload, register_upload
+from static import UploadStaticFiles
+from catalog import PRODUCT_SORTS, PRODUCT_SORT_PATTERN, ProductFilters, product_facets
+from projection import LIST_VIEW_PATTERN, mongo_projection, response_model
+from search import SEARCH_MIN_LENGTH, SEARCH_MAX_LIMIT, SEARCH_MAX_SKIP, SEARCH_TARGETS, search_catalog
+from bulk import BULK_COLLECTIONS, parse_csv, parse_ndjson, bulk_upsert, export_ndjson
+from images import create_derivatives, shutdown_pool
+from stats import get_stats, stats_update
+from slots import (
+    SLOTS, MAX_AVAILABILITY_DAYS,
+    availability_cache, backfill_slot_holds, holds_slot,
+    available_mask, mask_to_slots, date_range
+)
 
 ROOT_DIR = Path(__file__).parent
 load_dotenv(ROOT_DIR / '.env')
 
-# MongoDB connection
+# MongoDB connection (pool size and timeouts: see database.py)
 mongo_url = os.environ['MONGO_URL']
-client = AsyncIOMotorClient(mongo_url)
+client = create_client(mongo_url)
 db = client[os.environ['DB_NAME']]
 
+# Collection access for the CRUD endpoints: projection, limits, 404s, cache invalidation, timing
+product_repo = catalog_repository(db, "products", "Product not found")
+service_repo = catalog_repository(db, "services", "Service not found")
+blog_repo = catalog_repository(db, "blog_posts", "Blog post not found", max_limit=50)
+order_repo = Repository(db, "orders", "Order not found")
+booking_repo = Repository(db, "bookings", "Booking not found", sort=BY_DATE)
+contact_repo = Repository(db, "contact_messages", "Message not found")
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    if not proxy_headers_trusted():
+        logging.getLogger(__name__).warning(
+            "uvicorn trusts X-Forwarded-For only from 127.0.0.1: behind a remote proxy every client "
+            "shares the proxy's address for login rate limiting (set FORWARDED_ALLOW_IPS, see README)"
+        )
+    await backfill_slot_holds(db)
+    await ensure_indexes(db)
+    yield
+    client.close()
+    shutdown_pool()
+
+
 # Create the main app without a prefix
-app = FastAPI()
+app = FastAPI(lifespan=lifespan)
 
 # Create a router with the /api prefix
 api_router = APIRouter(prefix="/api")
@@ -44,13 +91,21 @@ UPLOADS_DIR.mkdir(exist_ok=True)
 
 # ============= AUTHENTICATION ENDPOINTS =============
 @api_router.post("/auth/login", response_model=Token)
-async def login(login_data: AdminLogin):
-    admin = authenticate_admin(login_data.email, login_data.password)
+async def login(login_data: AdminLogin, request: Request):
+    # Reject floods before they reach bcrypt. Behind the ingress request.client is the forwarded
+    # client IP only if uvicorn trusts the proxy (--forwarded-allow-ips, see README)
+    client_host = request.client.host if request.client else "unknown"
+    rate_key = login_rate_key(client_host, login_data.email)
+    check_login_rate(rate_key)
+    
+    admin = await authenticate_admin(login_data.email, login_data.password)
     if not admin:
+        login_rate_limiter.record_failure(rate_key)
         raise HTTPException(
             status_code=401,
             detail="Email o password non corretti"
         )
+    login_rate_limiter.reset(rate_key)
     access_token_expires = timedelta(minutes=ACCESS_TOKEN_EXPIRE_MINUTES)
     access_token = create_access_token(
         data={"sub": admin.email}, expires_delta=access_token_expires
@@ -74,19 +129,20 @@ async def upload_file(
     file: UploadFile = File(...),
     current_admin: AdminUser = Depends(get_current_admin)
 ):
-    # Generate unique filename
-    file_ext = Path(file.filename).suffix.lower()
-    if file_ext not in ['.jpg', '.jpeg', '.png', '.gif', '.webp']:
-        raise HTTPException(status_code=400, detail="Formato file non supportato")
-    
-    unique_filename = f"{uuid.uuid4()}{file_ext}"
-    file_path = UPLOADS_DIR / unique_filename
+    # Stream to disk in chunks; the stored type comes from the magic bytes, not the suffix.
+    # Files are stored by content hash, so re-uploading the same image writes nothing.
+    stored = await save_upload(file, UPLOADS_DIR)
     
-    with open(file_path, "wb") as buffer:
-        shutil.copyfileobj(file.file, buffer)
+    known = None if stored.created else await db.uploads.find_one({"_id": stored.digest}, {"srcset": 1})
+    if known and known.get("srcset") is not None:
+        srcset = known["srcset"]
+    else:
+        # Resized/WebP variants are encoded in a process pool, off the event loop
+        srcset = await create_derivatives(UPLOADS_DIR / stored.path)
+    await register_upload(db, stored, srcset)
     
-    # Return relative URL
-    return {"url": f"/api/uploads/{unique_filename}", "filename": unique_filename}
+    # Return relative URLs
+    return {"url": f"/api/uploads/{stored.path}", "filename": stored.path, "srcset": srcset}
 
 
 # Utility function to generate order/booking numbers
@@ -101,31 +157,68 @@ def generate_booking_number():
 
 
 # ============= PRODUCTS ENDPOINTS =============
+def product_filters(
+    featured: bool = None,
+    category: str = None,
+    brand: str = None,
+    flavor: str = None,
+    minPrice: float = None,
+    maxPrice: float = None,
+    inStock: bool = None,
+    glutenFree: bool = None,
+    lactoseFree: bool = None
+) -> ProductFilters:
+    return ProductFilters(featured, category, brand, flavor, minPrice, maxPrice, inStock, glutenFree, lactoseFree)
+
+
 @api_router.get("/products")
-async def get_products(featured: bool = None, limit: int = 100, skip: int = 0):
-    query = {}
-    if featured is not None:
-        query["featured"] = featured
-    
-    projection = {'_id': 0}  # Exclude MongoDB _id, keep all other fields
-    products = await db.products.find(query, projection).skip(skip).limit(min(limit, 100)).to_list(100)
-    return [Product(**product) for product in products]
+async def get_products(
+    request: Request,
+    filters: ProductFilters = Depends(product_filters),
+    sort: str = Query(None, pattern=PRODUCT_SORT_PATTERN),
+    view: str = Query("card", pattern=LIST_VIEW_PATTERN),
+    fields: str = None,
+    limit: int = 100,
+    skip: int = 0
+):
+    model = response_model(Product, ProductCard, view, fields)
+
+    async def load():
+        # Only fetch and validate what the list view returns
+        products = await product_repo.find(
+            filters.query(), PRODUCT_SORTS.get(sort), skip, limit, mongo_projection(model)
+        )
+        # Validate and encode once per catalog version, then serve the bytes
+        items = [model(**product).dict() for product in products]
+        return encode_payload(items)
+
+    payload = await product_repo.cached(("list", filters, sort, model, skip, limit), load)
+    return payload_response(payload, request)
+
+
+@api_router.get("/products-facets")
+async def get_product_facets(request: Request, filters: ProductFilters = Depends(product_filters)):
+    async def load():
+        return encode_payload(await product_facets(db, filters))
+
+    payload = await product_repo.cached(("facets", filters), load)
+    return payload_response(payload, request)
 
 
 @api_router.get("/products/{product_id}")
-async def get_product(product_id: str):
-    product = await db.products.find_one({"id": product_id})
-    if not product:
-        raise HTTPException(status_code=404, detail="Product not found")
-    return Product(**product)
+async def get_product(product_id: str, request: Request):
+    async def load():
+        product = Product(**await product_repo.get(product_id))
+        return encode_payload(product.dict(), product.updatedAt)
+
+    payload = await product_repo.cached(("item", product_id), load)
+    return payload_response(payload, request)
 
 
 @api_router.post("/products", response_model=Product)
 async def create_product(product: ProductCreate):
     product_dict = product.dict()
-    product_obj = Product(**product_dict)
-    await db.products.insert_one(product_obj.dict())
-    return product_obj
+    return await product_repo.insert(Product(**product_dict))
 
 
 @api_router.put("/products/{product_id}", response_model=Product)
@@ -133,48 +226,42 @@ async def update_product(product_id: str, product_update: ProductUpdate):
     update_data = {k: v for k, v in product_update.dict().items() if v is not None}
     update_data["updatedAt"] = datetime.utcnow()
     
-    result = await db.products.update_one(
-        {"id": product_id},
-        {"$set": update_data}
-    )
-    
-    if result.matched_count == 0:
-        raise HTTPException(status_code=404, detail="Product not found")
-    
-    updated_product = await db.products.find_one({"id": product_id})
-    return Product(**updated_product)
+    return Product(**await product_repo.update(product_id, {"$set": update_data}))
 
 
 @api_router.delete("/products/{product_id}")
 async def delete_product(product_id: str):
-    result = await db.products.delete_one({"id": product_id})
-    if result.deleted_count == 0:
-        raise HTTPException(status_code=404, detail="Product not found")
+    await product_repo.delete(product_id)
     return {"message": "Product deleted successfully"}
 
 
 # ============= SERVICES ENDPOINTS =============
 @api_router.get("/services")
-async def get_services(limit: int = 100):
-    projection = {'_id': 0}
-    services = await db.services.find({}, projection).limit(min(limit, 100)).to_list(100)
-    return [Service(**service) for service in services]
+async def get_services(request: Request, limit: int = 100):
+    limit = service_repo.clamp(limit)
+
+    async def load():
+        services = [Service(**service) for service in await service_repo.find({}, limit=limit)]
+        return encode_payload([service.dict() for service in services])
+
+    payload = await service_repo.cached(("list", limit), load)
+    return payload_response(payload, request)
 
 
 @api_router.get("/services/{service_id}")
-async def get_service(service_id: str):
-    service = await db.services.find_one({"id": service_id})
-    if not service:
-        raise HTTPException(status_code=404, detail="Service not found")
-    return Service(**service)
+async def get_service(service_id: str, request: Request):
+    async def load():
+        service = Service(**await service_repo.get(service_id))
+        return encode_payload(service.dict(), service.updatedAt)
+
+    payload = await service_repo.cached(("item", service_id), load)
+    return payload_response(payload, request)
 
 
 @api_router.post("/services", response_model=Service)
 async def create_service(service: ServiceCreate):
     service_dict = service.dict()
-    service_obj = Service(**service_dict)
-    await db.services.insert_one(service_obj.dict())
-    return service_obj
+    return await service_repo.insert(Service(**service_dict))
 
 
 @api_router.put("/services/{service_id}", response_model=Service)
@@ -182,52 +269,42 @@ async def update_service(service_id: str, service_update: ServiceUpdate):
     update_data = {k: v for k, v in service_update.dict().items() if v is not None}
     update_data["updatedAt"] = datetime.utcnow()
     
-    result = await db.services.update_one(
-        {"id": service_id},
-        {"$set": update_data}
-    )
-    
-    if result.matched_count == 0:
-        raise HTTPException(status_code=404, detail="Service not found")
-    
-    updated_service = await db.services.find_one({"id": service_id})
-    return Service(**updated_service)
+    return Service(**await service_repo.update(service_id, {"$set": update_data}))
 
 
 @api_router.delete("/services/{service_id}")
 async def delete_service(service_id: str):
-    result = await db.services.delete_one({"id": service_id})
-    if result.deleted_count == 0:
-        raise HTTPException(status_code=404, detail="Service not found")
+    await service_repo.delete(service_id)
     return {"message": "Service deleted successfully"}
 
 
 # ============= ORDERS ENDPOINTS =============
 @api_router.get("/orders")
-async def get_orders(status: str = None, limit: int = 50, skip: int = 0):
+async def get_orders(status: str = None, limit: int = 50, skip: int = 0, cursor: str = None):
     query = {}
     if status:
         query["status"] = status
     
-    projection = {'_id': 0}
-    orders = await db.orders.find(query, projection).sort("createdAt", -1).skip(skip).limit(min(limit, 100)).to_list(100)
+    if cursor is not None:
+        orders, next_cursor = await order_repo.page(query, cursor, limit)
+        return {"items": [Order(**order) for order in orders], "nextCursor": next_cursor}
+
+    orders = await order_repo.find(query, order_repo.sort, skip, limit)
     return [Order(**order) for order in orders]
 
 
 @api_router.get("/orders/{order_id}")
 async def get_order(order_id: str):
-    order = await db.orders.find_one({"id": order_id})
-    if not order:
-        raise HTTPException(status_code=404, detail="Order not found")
-    return Order(**order)
+    return Order(**await order_repo.get(order_id))
 
 
 @api_router.post("/orders", response_model=Order)
 async def create_order(order: OrderCreate):
     order_dict = order.dict()
     order_dict["orderNumber"] = generate_order_number()
-    order_obj = Order(**order_dict)
-    await db.orders.insert_one(order_obj.dict())
+    async with stats_update(db) as stats:
+        order_obj = await order_repo.insert(Order(**order_dict))
+        stats.created("orders", order_obj.status, order_obj.total)
     return order_obj
 
 
@@ -238,88 +315,73 @@ async def update_order_status(order_id: str, status_update: OrderStatusUpdate):
         "updatedAt": datetime.utcnow()
     }
     
-    result = await db.orders.update_one(
-        {"id": order_id},
-        {"$set": update_data}
-    )
-    
-    if result.matched_count == 0:
-        raise HTTPException(status_code=404, detail="Order not found")
+    # Read the previous status in the same round trip to keep the stats counters exact
+    async with stats_update(db) as stats:
+        previous = await order_repo.update(order_id, {"$set": update_data}, ReturnDocument.BEFORE)
+        stats.status_changed("orders", previous.get("status"), status_update.status)
     
-    updated_order = await db.orders.find_one({"id": order_id})
-    return Order(**updated_order)
+    return Order(**{**previous, **update_data})
 
 
 @api_router.get("/orders-stats")
-async def get_order_stats():
-    total_orders = await db.orders.count_documents({})
-    pending_orders = await db.orders.count_documents({"status": "pending"})
-    
-    # Calculate total revenue
-    pipeline = [
-        {"$group": {"_id": None, "total": {"$sum": "$total"}}}
-    ]
-    result = await db.orders.aggregate(pipeline).to_list(1)
-    total_revenue = result[0]["total"] if result else 0
-    
-    # Recent orders with projection
-    projection = {'_id': 0}
-    recent_orders = await db.orders.find({}, projection).sort("createdAt", -1).limit(5).to_list(5)
+async def get_order_stats(refresh: bool = False):
+    # Recent orders come from the (createdAt, id) index, concurrently with the counters
+    stats, recent_orders = await asyncio.gather(
+        get_stats(db, refresh=refresh),
+        order_repo.find({}, order_repo.sort, limit=5)
+    )
+    orders = stats["orders"]
     
     return {
-        "totalOrders": total_orders,
-        "pendingOrders": pending_orders,
-        "totalRevenue": total_revenue,
-        "recentOrders": [Order(**order) for order in recent_orders]
+        "totalOrders": orders["total"],
+        "pendingOrders": orders["byStatus"].get("pending", 0),
+        "totalRevenue": orders["revenue"],
+        "recentOrders": [Order(**order) for order in recent_orders],
+        "bookings": stats["bookings"],
+        "contacts": stats["contacts"]
     }
 
 
 # ============= BOOKINGS ENDPOINTS =============
 @api_router.get("/bookings")
-async def get_bookings(status: str = None, date: str = None, limit: int = 100, skip: int = 0):
+async def get_bookings(status: str = None, date: str = None, limit: int = 100, skip: int = 0, cursor: str = None):
     query = {}
     if status:
         query["status"] = status
     if date:
         query["date"] = date
     
-    projection = {'_id': 0}
-    bookings = await db.bookings.find(query, projection).sort("date", 1).skip(skip).limit(min(limit, 100)).to_list(100)
+    if cursor is not None:
+        bookings, next_cursor = await booking_repo.page(query, cursor, limit)
+        return {"items": [Booking(**booking) for booking in bookings], "nextCursor": next_cursor}
+
+    bookings = await booking_repo.find(query, booking_repo.sort, skip, limit)
     return [Booking(**booking) for booking in bookings]
 
 
 @api_router.get("/bookings/{booking_id}")
 async def get_booking(booking_id: str):
-    booking = await db.bookings.find_one({"id": booking_id})
-    if not booking:
-        raise HTTPException(status_code=404, detail="Booking not found")
-    return Booking(**booking)
+    return Booking(**await booking_repo.get(booking_id))
 
 
 @api_router.post("/bookings", response_model=Booking)
 async def create_booking(booking: BookingCreate):
     # Get service details
-    service = await db.services.find_one({"id": booking.serviceId})
-    if not service:
-        raise HTTPException(status_code=404, detail="Service not found")
-    
-    # Check if time slot is available
-    existing = await db.bookings.find_one({
-        "date": booking.date,
-        "time": booking.time,
-        "status": {"$in": ["pending", "confirmed"]}
-    })
-    
-    if existing:
-        raise HTTPException(status_code=400, detail="Time slot not available")
+    service = await service_repo.get(booking.serviceId, {'_id': 0, 'title': 1, 'price': 1})
     
     booking_dict = booking.dict()
     booking_dict["bookingNumber"] = generate_booking_number()
     booking_dict["serviceName"] = service["title"]
     booking_dict["servicePrice"] = service["price"]
     
-    booking_obj = Booking(**booking_dict)
-    await db.bookings.insert_one(booking_obj.dict())
+    # The unique partial index on (date, time) makes the insert an atomic reserve-or-fail
+    async with stats_update(db) as stats:
+        try:
+            booking_obj = await booking_repo.insert(Booking(**booking_dict), slotHeld=True)
+        except DuplicateKeyError:
+            raise HTTPException(status_code=400, detail="Time slot not available")
+        stats.created("bookings", booking_obj.status)
+    await availability_cache.mark(booking_obj.date, booking_obj.time, taken=True)
     return booking_obj
 
 
@@ -330,64 +392,113 @@ async def update_booking_status(booking_id: str, status_update: BookingStatusUpd
         "updatedAt": datetime.utcnow()
     }
     
-    result = await db.bookings.update_one(
-        {"id": booking_id},
-        {"$set": update_data}
-    )
+    # Cancelling releases the slot; re-activating has to win it back
+    if holds_slot(status_update.status):
+        update = {"$set": {**update_data, "slotHeld": True}}
+    else:
+        update = {"$set": update_data, "$unset": {"slotHeld": ""}}
+    
+    async with stats_update(db) as stats:
+        try:
+            previous = await booking_repo.update(booking_id, update, ReturnDocument.BEFORE)
+        except DuplicateKeyError:
+            raise HTTPException(status_code=400, detail="Time slot not available")
+        stats.status_changed("bookings", previous.get("status"), status_update.status)
+    
+    # Only touch the cached bit when this booking's hold actually changed: a booking that
+    # had already released its slot must not free it again while another booking holds it
+    held, holds = bool(previous.get("slotHeld")), holds_slot(status_update.status)
+    if held != holds:
+        await availability_cache.mark(previous["date"], previous["time"], taken=holds)
+    return Booking(**{**previous, **update_data})
+
+
+def parse_booking_date(value: str) -> date_type:
+    try:
+        return date_type.fromisoformat(value)
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid date, expected YYYY-MM-DD")
+
+
+@api_router.get("/bookings-available")
+async def get_availability_range(
+    date_from: str = Query(..., alias="from"),
+    date_to: str = Query(..., alias="to"),
+    serviceId: str = None
+):
+    start, end = parse_booking_date(date_from), parse_booking_date(date_to)
+    if end < start:
+        raise HTTPException(status_code=400, detail="'to' must not be before 'from'")
+    if (end - start).days >= MAX_AVAILABILITY_DAYS:
+        raise HTTPException(status_code=400, detail=f"Range limited to {MAX_AVAILABILITY_DAYS} days")
+    
+    if serviceId and not await service_repo.collection.find_one({"id": serviceId}, {'_id': 1}):
+        raise HTTPException(status_code=404, detail="Service not found")
     
-    if result.matched_count == 0:
-        raise HTTPException(status_code=404, detail="Booking not found")
+    booked = await availability_cache.booked_range(db, start.isoformat(), end.isoformat())
     
-    updated_booking = await db.bookings.find_one({"id": booking_id})
-    return Booking(**updated_booking)
+    # Bit i of each day's value is set when slots[i] is free
+    return {
+        "slots": SLOTS,
+        "days": {
+            day.isoformat(): available_mask(day, booked.get(day.isoformat(), 0))
+            for day in date_range(start, end)
+        }
+    }
 
 
 @api_router.get("/bookings-available/{date}")
 async def get_available_slots(date: str):
-    all_slots = [
-        "09:00", "09:30", "10:00", "10:30", "11:00", "11:30",
-        "14:00", "14:30", "15:00", "15:30", "16:00", "16:30", "17:00", "17:30"
-    ]
-    
-    # Fetch only the 'time' field for efficiency
-    projection = {'_id': 0, 'time': 1}
-    booked = await db.bookings.find({
-        "date": date,
-        "status": {"$in": ["pending", "confirmed"]}
-    }, projection).limit(50).to_list(50)
-    
-    booked_times = [b["time"] for b in booked]
-    available = [slot for slot in all_slots if slot not in booked_times]
-    
-    return {"availableSlots": available}
+    day = parse_booking_date(date)
+    booked = await availability_cache.booked(db, day.isoformat())
+    return {"availableSlots": mask_to_slots(available_mask(day, booked))}
 
 
 # ============= BLOG ENDPOINTS =============
 @api_router.get("/blog")
-async def get_blog_posts(published: bool = None, limit: int = 20, skip: int = 0):
-    query = {}
-    if published is not None:
-        query["published"] = published
-    
-    projection = {'_id': 0}
-    posts = await db.blog_posts.find(query, projection).sort("createdAt", -1).skip(skip).limit(min(limit, 50)).to_list(50)
-    return [BlogPost(**post) for post in posts]
+async def get_blog_posts(
+    request: Request,
+    published: bool = None,
+    view: str = Query("card", pattern=LIST_VIEW_PATTERN),
+    fields: str = None,
+    limit: int = 20,
+    skip: int = 0,
+    cursor: str = None
+):
+    limit = blog_repo.clamp(limit)
+    model = response_model(BlogPost, BlogPostCard, view, fields)
+
+    async def load():
+        query = {}
+        if published is not None:
+            query["published"] = published
+
+        projection = mongo_projection(model)
+        if cursor is not None:
+            posts, next_cursor = await blog_repo.page(query, cursor, limit, projection)
+            return encode_payload({"items": [model(**post).dict() for post in posts], "nextCursor": next_cursor})
+
+        posts = await blog_repo.find(query, blog_repo.sort, skip, limit, projection)
+        return encode_payload([model(**post).dict() for post in posts])
+
+    payload = await blog_repo.cached(("list", published, model, skip, limit, cursor), load)
+    return payload_response(payload, request)
 
 
 @api_router.get("/blog/{post_id}")
-async def get_blog_post(post_id: str):
-    post = await db.blog_posts.find_one({"id": post_id})
-    if not post:
-        raise HTTPException(status_code=404, detail="Blog post not found")
-    return BlogPost(**post)
+async def get_blog_post(post_id: str, request: Request):
+    async def load():
+        post = BlogPost(**await blog_repo.get(post_id))
+        return encode_payload(post.dict(), post.updatedAt)
+
+    payload = await blog_repo.cached(("item", post_id), load)
+    return payload_response(payload, request)
 
 
 @api_router.post("/blog", response_model=BlogPost)
 async def create_blog_post(post: BlogPostCreate):
     post_dict = post.dict()
-    post_obj = BlogPost(**post_dict)
-    await db.blog_posts.insert_one(post_obj.dict())
-    return post_obj
+    return await blog_repo.insert(BlogPost(**post_dict))
 
 
 @api_router.put("/blog/{post_id}", response_model=BlogPost)
@@ -395,23 +506,12 @@ async def update_blog_post(post_id: str, post_update: BlogPostUpdate):
     update_data = {k: v for k, v in post_update.dict().items() if v is not None}
     update_data["updatedAt"] = datetime.utcnow()
     
-    result = await db.blog_posts.update_one(
-        {"id": post_id},
-        {"$set": update_data}
-    )
-    
-    if result.matched_count == 0:
-        raise HTTPException(status_code=404, detail="Blog post not found")
-    
-    updated_post = await db.blog_posts.find_one({"id": post_id})
-    return BlogPost(**updated_post)
+    return BlogPost(**await blog_repo.update(post_id, {"$set": update_data}))
 
 
 @api_router.delete("/blog/{post_id}")
 async def delete_blog_post(post_id: str):
-    result = await db.blog_posts.delete_one({"id": post_id})
-    if result.deleted_count == 0:
-        raise HTTPException(status_code=404, detail="Blog post not found")
+    await blog_repo.delete(post_id)
     return {"message": "Blog post deleted successfully"}
 
 
@@ -419,34 +519,115 @@ async def delete_blog_post(post_id: str):
 @api_router.post("/contact", response_model=ContactMessage)
 async def create_contact_message(message: ContactMessageCreate):
     message_dict = message.dict()
-    message_obj = ContactMessage(**message_dict)
-    await db.contact_messages.insert_one(message_obj.dict())
+    async with stats_update(db) as stats:
+        message_obj = await contact_repo.insert(ContactMessage(**message_dict))
+        stats.created("contacts", message_obj.status)
     return message_obj
 
 
 @api_router.get("/contact")
-async def get_contact_messages(status: str = None, limit: int = 100, skip: int = 0):
+async def get_contact_messages(status: str = None, limit: int = 100, skip: int = 0, cursor: str = None):
     query = {}
     if status:
         query["status"] = status
     
-    projection = {'_id': 0}
-    messages = await db.contact_messages.find(query, projection).sort("createdAt", -1).skip(skip).limit(min(limit, 100)).to_list(100)
+    if cursor is not None:
+        messages, next_cursor = await contact_repo.page(query, cursor, limit)
+        return {"items": [ContactMessage(**msg) for msg in messages], "nextCursor": next_cursor}
+
+    messages = await contact_repo.find(query, contact_repo.sort, skip, limit)
     return [ContactMessage(**msg) for msg in messages]
 
 
 @api_router.put("/contact/{message_id}", response_model=ContactMessage)
 async def update_contact_message_status(message_id: str, status_update: ContactMessageStatusUpdate):
-    result = await db.contact_messages.update_one(
-        {"id": message_id},
-        {"$set": {"status": status_update.status}}
+    update_data = {"status": status_update.status}
+    async with stats_update(db) as stats:
+        previous = await contact_repo.update(message_id, {"$set": update_data}, ReturnDocument.BEFORE)
+        stats.status_changed("contacts", previous.get("status"), status_update.status)
+    
+    return ContactMessage(**{**previous, **update_data})
+
+
+# ============= SEARCH ENDPOINTS =============
+@api_router.get("/search")
+async def search(
+    request: Request,
+    q: str,
+    type: str = Query("all", pattern="^(all|products|blog)$"),
+    limit: int = 20,
+    skip: int = 0
+):
+    q = q.strip()
+    if len(q) < SEARCH_MIN_LENGTH:
+        raise HTTPException(status_code=400, detail="Search query too short")
+    limit = max(1, min(limit, SEARCH_MAX_LIMIT))
+    skip = max(0, min(skip, SEARCH_MAX_SKIP))
+    types = list(SEARCH_TARGETS) if type == "all" else [type]
+
+    results = await search_catalog(db, q, types, skip, limit)
+    return payload_response(encode_payload(results), request)
+
+
+# ============= BULK IMPORT/EXPORT ENDPOINTS =============
+def get_bulk_collection(collection: str):
+    if collection not in BULK_COLLECTIONS:
+        raise HTTPException(status_code=404, detail="Collection not found")
+    return BULK_COLLECTIONS[collection]
+
+
+@api_router.post("/admin/bulk/{collection}")
+async def bulk_import(
+    collection: str,
+    request: Request,
+    current_admin: AdminUser = Depends(get_current_admin)
+):
+    target = get_bulk_collection(collection)
+    body = await request.body()
+    if request.headers.get("content-type", "").startswith("text/csv"):
+        try:
+            rows = parse_csv(body)
+        except ValueError as exc:
+            raise HTTPException(status_code=400, detail=str(exc))
+    else:
+        rows = parse_ndjson(body)
+    
+    report = await bulk_upsert(db, target, rows)
+    catalog_cache.invalidate(target.collection)
+    return report
+
+
+@api_router.get("/admin/bulk/{collection}")
+async def bulk_export(collection: str, current_admin: AdminUser = Depends(get_current_admin)):
+    target = get_bulk_collection(collection)
+    return StreamingResponse(
+        export_ndjson(db, target),
+        media_type="application/x-ndjson",
+        headers={"Content-Disposition": f'attachment; filename="{collection}.ndjson"'}
     )
-    
-    if result.matched_count == 0:
-        raise HTTPException(status_code=404, detail="Message not found")
-    
-    updated_message = await db.contact_messages.find_one({"id": message_id})
-    return ContactMessage(**updated_message)
+
+
+# ============= PROFILING ENDPOINTS =============
+@api_router.get("/admin/profiles")
+async def list_profiles(current_admin: AdminUser = Depends(get_current_admin)):
+    return {"enabled": PROFILING_ENABLED, "items": await run_in_threadpool(profile_store.list)}
+
+
+@api_router.get("/admin/profiles/{trace_id}")
+async def get_profile(trace_id: str, current_admin: AdminUser = Depends(get_current_admin)):
+    trace = await run_in_threadpool(profile_store.get, trace_id)
+    if trace is None:
+        raise HTTPException(status_code=404, detail="Profile not found")
+    return trace
+
+
+@api_router.get("/admin/profiles/{trace_id}/prof")
+async def download_profile(trace_id: str, current_admin: AdminUser = Depends(get_current_admin)):
+    # Raw cProfile output, for snakeviz or pstats
+    path = profile_store.prof_path(trace_id)
+    if path is None:
+        raise HTTPException(status_code=404, detail="Profile not found")
+    return FileResponse(path, media_type="application/octet-stream", filename=path.name)
 
 
 # Health check
@@ -457,14 +638,37 @@ async def root():
 
 @api_router.get("/health")
 async def health_check():
-    return {"status": "healthy", "database": "connected"}
+    # 503 lets the load balancer take this worker out of rotation until the DB recovers
+    database = await check_database(db)
+    healthy = database["status"] == "connected"
+    return JSONResponse(
+        {"status": "healthy" if healthy else "degraded", "database": database},
+        status_code=200 if healthy else 503
+    )
+
+
+@api_router.get("/cache-stats")
+async def get_cache_stats(current_admin: AdminUser = Depends(get_current_admin)):
+    return {"catalog": catalog_cache.stats(), "availability": await availability_cache.stats()}
+
+
+@api_router.get("/repository-stats")
+async def get_repository_stats(current_admin: AdminUser = Depends(get_current_admin)):
+    return operation_timings.stats()
 
 
 # Include the router in the main app
 app.include_router(api_router)
 
-# Mount static files for uploads
-app.mount("/api/uploads", StaticFiles(directory=str(UPLOADS_DIR)), name="uploads")
+
+# Prometheus scrape target; outside /api so the public ingress doesn't expose it
+@app.get("/metrics", include_in_schema=False)
+async def metrics():
+    return PlainTextResponse(metrics_registry.render(), media_type="text/plain; version=0.0.4")
+
+
+# Mount static files for uploads (long-lived caching, precompressed siblings, ranges)
+app.mount("/api/uploads", UploadStaticFiles(directory=str(UPLOADS_DIR)), name="uploads")
 
 app.add_middleware(
     CORSMiddleware,
@@ -473,6 +677,11 @@ app.add_middleware(
     allow_methods=["*"],
     allow_headers=["*"],
 )
+app.add_middleware(UploadSizeLimitMiddleware)
+if PROFILING_ENABLED:
+    app.add_middleware(ProfilingMiddleware)
+# Added last, so it wraps CORS too and times the whole request
+app.add_middleware(MetricsMiddleware)
 
 # Configure logging
 logging.basicConfig(
@@ -480,8 +689,3 @@ logging.basicConfig(
     format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
 )
 logger = logging.getLogger(__name__)
-
-
-@app.on_event("shutdown")
-async def shutdown_db_client():
-    client.close()
@@ -0,0 +1,191 @@
+import logging
+import os
+from datetime import date, timedelta
+
+from cache import TTLCache
+
+logger = logging.getLogger(__name__)
+
+# Bookings in these statuses hold their time slot
+ACTIVE_BOOKING_STATUSES = ("pending", "confirmed")
+
+# Opening hours as comma-separated HH:MM-HH:MM ranges, split into fixed-length slots
+BOOKING_HOURS = os.environ.get("BOOKING_HOURS", "09:00-12:00,14:00-18:00")
+BOOKING_SLOT_MINUTES = int(os.environ.get("BOOKING_SLOT_MINUTES", "30"))
+# ISO weekdays (1 = Monday ... 7 = Sunday) with no slots at all
+BOOKING_CLOSED_WEEKDAYS = {
+    int(day) for day in os.environ.get("BOOKING_CLOSED_WEEKDAYS", "").split(",") if day.strip()
+}
+MAX_AVAILABILITY_DAYS = 92
+
+AVAILABILITY_CACHE_TTL = float(os.environ.get("AVAILABILITY_CACHE_TTL", "300"))  # seconds
+AVAILABILITY_CACHE_MAX_ENTRIES = int(os.environ.get("AVAILABILITY_CACHE_MAX_ENTRIES", "2048"))
+
+
+def _minutes(hhmm: str) -> int:
+    hours, minutes = hhmm.strip().split(":")
+    return int(hours) * 60 + int(minutes)
+
+
+def build_slots(hours: str, slot_minutes: int) -> list[str]:
+    slots = []
+    for opening in hours.split(","):
+        start, end = (_minutes(t) for t in opening.split("-"))
+        for minute in range(start, end - slot_minutes + 1, slot_minutes):
+            slots.append(f"{minute // 60:02d}:{minute % 60:02d}")
+    return slots
+
+
+SLOTS = build_slots(BOOKING_HOURS, BOOKING_SLOT_MINUTES)
+SLOT_BITS = {slot: 1 << i for i, slot in enumerate(SLOTS)}
+ALL_SLOTS_MASK = (1 << len(SLOTS)) - 1
+
+
+def holds_slot(status: str) -> bool:
+    return status in ACTIVE_BOOKING_STATUSES
+
+
+def booked_mask(times) -> int:
+    """Bitmap of taken slots; bit i stands for SLOTS[i]. Times outside opening hours are ignored."""
+    mask = 0
+    for time in times:
+        mask |= SLOT_BITS.get(time, 0)
+    return mask
+
+
+def available_mask(day: date, booked: int) -> int:
+    if day.isoweekday() in BOOKING_CLOSED_WEEKDAYS:
+        return 0
+    return ALL_SLOTS_MASK & ~booked
+
+
+def mask_to_slots(mask: int) -> list[str]:
+    return [slot for slot, bit in SLOT_BITS.items() if mask & bit]
+
+
+def date_range(start: date, end: date) -> list[date]:
+    return [start + timedelta(days=offset) for offset in range((end - start).days + 1)]
+
+
+async def booked_masks(db, start: str, end: str) -> dict[str, int]:
+    """Taken-slot bitmaps for every date in [start, end] that has bookings, in one aggregation."""
+    pipeline = [
+        {"$match": {"date": {"$gte": start, "$lte": end}, "slotHeld": True}},
+        {"$group": {"_id": "$date", "times": {"$addToSet": "$time"}}},
+    ]
+    rows = await db.bookings.aggregate(pipeline).to_list(None)
+    return {row["_id"]: booked_mask(row["times"]) for row in rows}
+
+
+class MemoryAvailabilityBackend:
+    """Default store: a TTLCache in this process, so each worker has its own copy.
+
+    A backend keeps one taken-slot bitmap per date plus a per-date version that every
+    bit change bumps, and must offer these coroutines (a shared store implements them
+    with its own atomic operations, e.g. SETBIT/INCR in Redis):
+        get_masks(days) -> {day: mask} for the cached days
+        versions(days)  -> {day: version}
+        fill(masks, versions): cache each mask unless its day's version moved on
+        set_bit(day, bit) / clear_bit(day, bit): change a cached bitmap, bump the version
+        stats() -> dict
+    """
+
+    def __init__(self, ttl: float = AVAILABILITY_CACHE_TTL, max_entries: int = AVAILABILITY_CACHE_MAX_ENTRIES):
+        self.cache = TTLCache(ttl, max_entries)
+
+    async def get_masks(self, days: list[str]) -> dict[str, int]:
+        masks = {}
+        for day in days:
+            mask = self.cache.get((day,))
+            if mask is not None:
+                masks[day] = mask
+        return masks
+
+    async def versions(self, days: list[str]) -> dict[str, int]:
+        return {day: self.cache.version(day) for day in days}
+
+    async def fill(self, masks: dict[str, int], versions: dict[str, int]) -> None:
+        for day, mask in masks.items():
+            if self.cache.version(day) == versions[day]:
+                self.cache.set((day,), mask)
+
+    async def set_bit(self, day: str, bit: int) -> None:
+        self.cache.update((day,), lambda mask: mask | bit)
+
+    async def clear_bit(self, day: str, bit: int) -> None:
+        self.cache.update((day,), lambda mask: mask & ~bit)
+
+    async def stats(self) -> dict:
+        return self.cache.stats()
+
+
+class AvailabilityCache:
+    """Per-date bitmaps of taken slots, written through by the booking handlers.
+
+    The backend (see MemoryAvailabilityBackend) can be swapped for a shared store in
+    multi-worker deployments. With the default in-process backend, writes made by other
+    workers show up once entries expire; the unique slot index still prevents double
+    bookings either way.
+    """
+
+    def __init__(self, backend=None):
+        self.backend = backend or MemoryAvailabilityBackend()
+
+    async def booked(self, db, day: str) -> int:
+        return (await self.booked_range(db, day, day))[day]
+
+    async def booked_range(self, db, start: str, end: str) -> dict[str, int]:
+        days = [d.isoformat() for d in date_range(date.fromisoformat(start), date.fromisoformat(end))]
+        masks = await self.backend.get_masks(days)
+        missing = [day for day in days if day not in masks]
+        if not missing:
+            return masks
+
+        # One aggregation covering every missing date
+        versions = await self.backend.versions(missing)
+        loaded = await booked_masks(db, missing[0], missing[-1])
+        loaded = {day: loaded.get(day, 0) for day in missing}
+        await self.backend.fill(loaded, versions)
+        return {**masks, **loaded}
+
+    async def mark(self, day: str, time: str, taken: bool) -> None:
+        bit = SLOT_BITS.get(time, 0)
+        if taken:
+            await self.backend.set_bit(day, bit)
+        else:
+            await self.backend.clear_bit(day, bit)
+
+    async def stats(self) -> dict:
+        return await self.backend.stats()
+
+
+availability_cache = AvailabilityCache()
+
+
+async def backfill_slot_holds(db) -> None:
+    """Flag bookings created before `slotHeld` existed so the unique slot index covers them.
+
+    Legacy double-bookings would make that index fail to build: the booking that already
+    holds the slot (else the oldest) keeps it, the others are released and logged so the
+    studio can reschedule them.
+    """
+    duplicates = db.bookings.aggregate([
+        {"$match": {
+            "status": {"$in": list(ACTIVE_BOOKING_STATUSES)},
+            "$or": [{"slotHeld": True}, {"slotHeld": {"$exists": False}}],
+        }},
+        {"$sort": {"slotHeld": -1, "createdAt": 1}},
+        {"$group": {"_id": {"date": "$date", "time": "$time"}, "ids": {"$push": "$id"}}},
+        {"$match": {"ids.1": {"$exists": True}}},
+    ])
+    async for slot in duplicates:
+        keep, *released = slot["ids"]
+        await db.bookings.update_many({"id": {"$in": released}}, {"$set": {"slotHeld": False}})
+        logger.warning(
+            "Slot %s %s is double-booked: booking %s keeps it, released %s",
+            slot["_id"]["date"], slot["_id"]["time"], keep, ", ".join(released),
+        )
+    await db.bookings.update_many(
+        {"status": {"$in": list(ACTIVE_BOOKING_STATUSES)}, "slotHeld": {"$exists": False}},
+        {"$set": {"slotHeld": True}}
+    )
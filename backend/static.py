@@ -0,0 +1,202 @@
+import os
+import stat
+from mimetypes import guess_type
+
+import anyio
+from starlette.datastructures import Headers
+from starlette.exceptions import HTTPException
+from starlette.responses import FileResponse, Response
+from starlette.staticfiles import NotModifiedResponse, StaticFiles
+from starlette.types import Receive, Scope, Send
+
+from cache import TTLCache
+from uploads import HASHED_PATH_RE
+
+STATIC_STAT_CACHE_TTL = float(os.environ.get("STATIC_STAT_CACHE_TTL", "60"))  # seconds
+STATIC_STAT_CACHE_MAX_ENTRIES = int(os.environ.get("STATIC_STAT_CACHE_MAX_ENTRIES", "4096"))
+
+# Content-addressed files never change, so clients may keep them forever
+IMMUTABLE_CACHE_CONTROL = "public, max-age=31536000, immutable"
+REVALIDATE_CACHE_CONTROL = "no-cache"
+
+# Preferred first: a `<file>.br` / `<file>.gz` sibling is served when the client accepts it
+PRECOMPRESSED_ENCODINGS = (("br", ".br"), ("gzip", ".gz"))
+
+
+def accepted_encodings(accept_encoding: str) -> set[str]:
+    encodings = set()
+    for item in accept_encoding.split(","):
+        name, _, params = item.strip().partition(";")
+        if params.strip().replace(" ", "") in ("q=0", "q=0.0", "q=0.00", "q=0.000"):
+            continue
+        if name:
+            encodings.add(name.strip().lower())
+    return encodings
+
+
+def parse_range(range_header: str, size: int) -> tuple[int, int] | None:
+    """Return the (start, end) byte range requested, or None to serve the whole file.
+
+    Only a single range is honoured; anything else falls back to a full response.
+    """
+    unit, _, ranges = range_header.partition("=")
+    if unit.strip().lower() != "bytes" or "," in ranges:
+        return None
+    start_text, _, end_text = ranges.strip().partition("-")
+    try:
+        if start_text:
+            start = int(start_text)
+            end = int(end_text) if end_text else size - 1
+        else:
+            # Suffix range: the last N bytes
+            start = max(size - int(end_text), 0)
+            end = size - 1
+    except ValueError:
+        return None
+    if start > end or start >= size:
+        raise HTTPException(status_code=416, headers={"Content-Range": f"bytes */{size}"})
+    return start, min(end, size - 1)
+
+
+def is_immutable(path: str) -> bool:
+    """Content-addressed file, or a precompressed sibling of one."""
+    path = path.replace(os.sep, "/")
+    for _, suffix in PRECOMPRESSED_ENCODINGS:
+        if path.endswith(suffix):
+            path = path[:-len(suffix)]
+            break
+    return HASHED_PATH_RE.fullmatch(path) is not None
+
+
+class UploadFileResponse(FileResponse):
+    """FileResponse that opens the file before sending headers.
+
+    A file removed since its stat was cached (e.g. by the uploads GC) then raises
+    FileNotFoundError while a clean 404 can still be sent. Otherwise it behaves like
+    FileResponse: the body goes through the server's `http.response.pathsend`
+    extension (sendfile) when offered, else it is streamed in chunks.
+    """
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        async with await anyio.open_file(self.path, mode="rb") as file:
+            await send({"type": "http.response.start", "status": self.status_code, "headers": self.raw_headers})
+            if scope["method"].upper() == "HEAD":
+                await send({"type": "http.response.body", "body": b"", "more_body": False})
+            elif "http.response.pathsend" in scope.get("extensions", {}):
+                await send({"type": "http.response.pathsend", "path": str(self.path)})
+            else:
+                more_body = True
+                while more_body:
+                    chunk = await file.read(self.chunk_size)
+                    more_body = len(chunk) == self.chunk_size
+                    await send({"type": "http.response.body", "body": chunk, "more_body": more_body})
+        if self.background is not None:
+            await self.background()
+
+
+class FileRangeResponse(FileResponse):
+    """206 response streaming one byte range of a file."""
+
+    def __init__(self, path: str, byte_range: tuple[int, int], stat_result: os.stat_result, **kwargs):
+        super().__init__(path, status_code=206, stat_result=stat_result, **kwargs)
+        self.start, self.end = byte_range
+        self.headers["content-length"] = str(self.end - self.start + 1)
+        self.headers["content-range"] = f"bytes {self.start}-{self.end}/{stat_result.st_size}"
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        remaining = self.end - self.start + 1
+        async with await anyio.open_file(self.path, mode="rb") as file:
+            await send({"type": "http.response.start", "status": self.status_code, "headers": self.raw_headers})
+            if scope["method"].upper() == "HEAD":
+                await send({"type": "http.response.body", "body": b"", "more_body": False})
+                return
+            await file.seek(self.start)
+            while remaining > 0:
+                chunk = await file.read(min(self.chunk_size, remaining))
+                if not chunk:
+                    break
+                remaining -= len(chunk)
+                await send({"type": "http.response.body", "body": chunk, "more_body": remaining > 0})
+        if remaining > 0:
+            # File shrank underneath us; terminate the body anyway
+            await send({"type": "http.response.body", "body": b"", "more_body": False})
+
+
+class UploadStaticFiles(StaticFiles):
+    """StaticFiles for /api/uploads with long-lived caching.
+
+    - hashed (content-addressed) files get `Cache-Control: immutable`
+    - precompressed `.br` / `.gz` siblings are served when accepted
+    - single byte ranges are answered with 206
+    - lookups of hashed files are cached in memory, so repeated hits skip stat()
+      calls; other paths can change or appear at any time and are always stat()ed
+    Full responses use the server's `http.response.pathsend` extension (sendfile)
+    when available, see UploadFileResponse.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.stat_cache = TTLCache(STATIC_STAT_CACHE_TTL, STATIC_STAT_CACHE_MAX_ENTRIES)
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        path = self.get_path(scope)
+        try:
+            await super().__call__(scope, receive, send)
+        except FileNotFoundError:
+            # Deleted after its stat was cached; headers are sent only once the file is open
+            for suffix in ("", *(suffix for _, suffix in PRECOMPRESSED_ENCODINGS)):
+                self.stat_cache.discard((path + suffix,))
+            raise HTTPException(status_code=404)
+
+    async def cached_lookup(self, path: str) -> tuple[str, os.stat_result | None]:
+        result = self.stat_cache.get((path,))
+        if result is None:
+            result = await anyio.to_thread.run_sync(self.lookup_path, path)
+            # Misses are never cached: the file may be uploaded a moment later
+            if result[1] is not None and is_immutable(path):
+                self.stat_cache.set((path,), result)
+        return result
+
+    async def get_response(self, path: str, scope: Scope) -> Response:
+        if scope["method"] not in ("GET", "HEAD"):
+            raise HTTPException(status_code=405)
+
+        try:
+            full_path, stat_result = await self.cached_lookup(path)
+        except PermissionError:
+            raise HTTPException(status_code=401)
+        if stat_result is None or not stat.S_ISREG(stat_result.st_mode):
+            raise HTTPException(status_code=404)
+
+        request_headers = Headers(scope=scope)
+        immutable = is_immutable(path)
+        headers = {
+            "Cache-Control": IMMUTABLE_CACHE_CONTROL if immutable else REVALIDATE_CACHE_CONTROL,
+            "Accept-Ranges": "bytes",
+            "Vary": "Accept-Encoding",
+        }
+        media_type = guess_type(full_path)[0] or "application/octet-stream"
+
+        accepted = accepted_encodings(request_headers.get("accept-encoding", ""))
+        for encoding, suffix in PRECOMPRESSED_ENCODINGS:
+            if encoding not in accepted:
+                continue
+            encoded_path, encoded_stat = await self.cached_lookup(path + suffix)
+            if encoded_stat is not None and stat.S_ISREG(encoded_stat.st_mode):
+                headers["Content-Encoding"] = encoding
+                full_path, stat_result = encoded_path, encoded_stat
+                break
+
+        response = UploadFileResponse(full_path, stat_result=stat_result, media_type=media_type, headers=headers)
+        if self.is_not_modified(response.headers, request_headers):
+            return NotModifiedResponse(response.headers)
+
+        range_header = request_headers.get("range")
+        if_range = request_headers.get("if-range")
+        if range_header and "Content-Encoding" not in headers and if_range in (None, response.headers["etag"]):
+            byte_range = parse_range(range_header, stat_result.st_size)
+            if byte_range is not None:
+                return FileRangeResponse(
+                    full_path, byte_range, stat_result, media_type=media_type, headers=headers
+                )
+        return response
@@ -0,0 +1,148 @@
+import asyncio
+import logging
+import os
+from contextlib import asynccontextmanager
+from datetime import datetime
+
+from pymongo.errors import DuplicateKeyError
+
+logger = logging.getLogger(__name__)
+
+# Keep a counters document updated with $inc so the dashboard never scans collections
+STATS_MATERIALIZED = os.environ.get("STATS_MATERIALIZED", "true").lower() in ("1", "true", "yes")
+STATS_DOC_ID = "dashboard"
+# A rebuild waits out in-flight writes for up to ATTEMPTS x WAIT before giving up
+STATS_REBUILD_ATTEMPTS = int(os.environ.get("STATS_REBUILD_ATTEMPTS", "5"))
+STATS_REBUILD_WAIT = float(os.environ.get("STATS_REBUILD_WAIT", "0.2"))  # seconds
+
+# Dashboard section -> source collection
+SECTIONS = {
+    "orders": "orders",
+    "bookings": "bookings",
+    "contacts": "contact_messages",
+}
+
+
+def _status_key(status: str) -> str:
+    # Statuses become field names inside the stats document
+    return str(status).replace(".", "_").replace("$", "_")
+
+
+def _empty_section() -> dict:
+    return {"total": 0, "revenue": 0, "byStatus": {}}
+
+
+async def _aggregate_section(collection) -> dict:
+    pipeline = [{"$facet": {
+        "totals": [{"$group": {"_id": None, "total": {"$sum": 1}, "revenue": {"$sum": "$total"}}}],
+        "byStatus": [{"$group": {"_id": "$status", "count": {"$sum": 1}}}],
+    }}]
+    result = await collection.aggregate(pipeline).to_list(1)
+    section = _empty_section()
+    if result and result[0]["totals"]:
+        section["total"] = result[0]["totals"][0]["total"]
+        section["revenue"] = result[0]["totals"][0]["revenue"]
+    for row in result[0]["byStatus"] if result else []:
+        section["byStatus"][_status_key(row["_id"])] = row["count"]
+    return section
+
+
+async def compute_stats(db) -> dict:
+    """Aggregate every dashboard section from scratch, one $facet per collection."""
+    sections = await asyncio.gather(
+        *(_aggregate_section(db[collection]) for collection in SECTIONS.values())
+    )
+    stats = dict(zip(SECTIONS, sections))
+    # Revenue only makes sense for orders
+    stats["bookings"].pop("revenue")
+    stats["contacts"].pop("revenue")
+    return stats
+
+
+async def _rebuild(db) -> dict:
+    """Recompute the counters and store them only if no write overlapped the aggregation.
+
+    Writes mark themselves pending before touching the source collection and bump `writes`
+    when their counters land, so an unchanged `writes` with nothing pending at the end
+    means the aggregate saw exactly the writes the stored counters will not replay.
+    """
+    seen = set()
+    stats = None
+    for _ in range(STATS_REBUILD_ATTEMPTS):
+        doc = await db.stats.find_one({"_id": STATS_DOC_ID}, {"writes": 1, "pending": 1})
+        writes, pending = (doc or {}).get("writes", 0), (doc or {}).get("pending", 0)
+        seen.add((writes, pending))
+        if pending > 0:
+            await asyncio.sleep(STATS_REBUILD_WAIT)
+            continue
+        stats = await compute_stats(db)
+        built = {**stats, "writes": writes, "pending": 0, "builtAt": datetime.utcnow()}
+        if doc is None:
+            try:
+                await db.stats.insert_one({"_id": STATS_DOC_ID, **built})
+                return stats
+            except DuplicateKeyError:
+                continue
+        result = await db.stats.replace_one({"_id": STATS_DOC_ID, "writes": writes, "pending": {"$lte": 0}}, built)
+        if result.matched_count:
+            return stats
+
+    if len(seen) == 1 and pending > 0:
+        # Nothing moved while we waited: a worker died mid-write and left pending behind
+        logger.warning("Resetting stats counters stuck with %d pending writes", pending)
+        stats = await compute_stats(db)
+        await db.stats.replace_one(
+            {"_id": STATS_DOC_ID}, {**stats, "writes": writes, "pending": 0, "builtAt": datetime.utcnow()}
+        )
+        return stats
+    # Busy: serve the fresh aggregate and leave the stored counters to the next rebuild
+    return stats if stats is not None else await compute_stats(db)
+
+
+async def get_stats(db, refresh: bool = False) -> dict:
+    if not STATS_MATERIALIZED:
+        return await compute_stats(db)
+
+    doc = None if refresh else await db.stats.find_one({"_id": STATS_DOC_ID})
+    # Counters upserted before any rebuild (no builtAt) are partial
+    if doc is None or "builtAt" not in doc:
+        return await _rebuild(db)
+    return {section: doc.get(section) or _empty_section() for section in SECTIONS}
+
+
+class StatsUpdate:
+    """Counter increments collected while a write is in flight."""
+
+    def __init__(self):
+        self.inc = {}
+
+    def _add(self, field: str, amount) -> None:
+        self.inc[field] = self.inc.get(field, 0) + amount
+
+    def created(self, section: str, status: str, revenue: float = 0) -> None:
+        self._add(f"{section}.total", 1)
+        self._add(f"{section}.byStatus.{_status_key(status)}", 1)
+        if revenue:
+            self._add(f"{section}.revenue", revenue)
+
+    def status_changed(self, section: str, old_status: str, new_status: str) -> None:
+        if old_status == new_status:
+            return
+        self._add(f"{section}.byStatus.{_status_key(old_status)}", -1)
+        self._add(f"{section}.byStatus.{_status_key(new_status)}", 1)
+
+
+@asynccontextmanager
+async def stats_update(db):
+    """Wrap a source write; its counters are applied with $inc once the block exits."""
+    update = StatsUpdate()
+    if not STATS_MATERIALIZED:
+        yield update
+        return
+    await db.stats.update_one({"_id": STATS_DOC_ID}, {"$inc": {"pending": 1}}, upsert=True)
+    try:
+        yield update
+    finally:
+        await db.stats.update_one(
+            {"_id": STATS_DOC_ID}, {"$inc": {**update.inc, "pending": -1, "writes": 1}}, upsert=True
+        )
@@ -7,6 +7,8 @@ import pytest
 import requests
 import os
 import uuid
+import random
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 
 BASE_URL = os.environ.get('REACT_APP_BACKEND_URL', '').rstrip('/')
@@ -52,6 +54,9 @@ class TestHealthCheck:
         assert response.status_code == 200
         data = response.json()
         assert data["status"] == "healthy"
+        assert data["database"]["status"] == "connected"
+        assert data["database"]["latencyMs"] >= 0
+        assert "utilization" in data["database"]["pool"]
         print(f"Health check passed: {data}")
 
     def test_api_root(self, session):
@@ -62,6 +67,20 @@ class TestHealthCheck:
         print(f"API root: {data}")
 
 
+class TestMetrics:
+    """Prometheus metrics endpoint"""
+
+    def test_metrics_exposition(self, session):
+        session.get(f"{API}/products")
+        response = session.get(f"{BASE_URL}/metrics")
+        if response.status_code == 404:
+            pytest.skip("/metrics is not routed through this ingress")
+        assert response.status_code == 200
+        assert response.headers["content-type"].startswith("text/plain")
+        assert 'http_request_duration_seconds_bucket{method="GET",route="/api/products",le="+Inf"}' in response.text
+        assert "http_requests_in_flight" in response.text
+
+
 class TestAuthentication:
     """Admin login/logout tests"""
     
@@ -325,6 +344,14 @@ class TestOrders:
         assert "pendingOrders" in data
         print(f"Order stats: {data['totalOrders']} orders, €{data['totalRevenue']} revenue")
 
+    def test_order_stats_cover_bookings_and_contacts(self, auth_session):
+        response = auth_session.get(f"{API}/orders-stats", params={"refresh": True})
+        assert response.status_code == 200
+        data = response.json()
+        for section in ("bookings", "contacts"):
+            assert "total" in data[section]
+            assert isinstance(data[section]["byStatus"], dict)
+
     def test_create_order(self, session):
         order_data = {
             "items": [{
@@ -389,6 +416,18 @@ class TestBookings:
         assert isinstance(data["availableSlots"], list)
         print(f"Available slots for {future_date}: {len(data['availableSlots'])}")
 
+    def test_get_availability_range(self, session):
+        response = session.get(f"{API}/bookings-available", params={"from": "2026-02-01", "to": "2026-02-28"})
+        assert response.status_code == 200
+        data = response.json()
+        assert isinstance(data["slots"], list)
+        assert len(data["days"]) == 28
+        assert all(0 <= mask < (1 << len(data["slots"])) for mask in data["days"].values())
+
+    def test_availability_range_rejects_inverted_range(self, session):
+        response = session.get(f"{API}/bookings-available", params={"from": "2026-02-28", "to": "2026-02-01"})
+        assert response.status_code == 400
+
 
 class TestContactMessages:
     """Contact messages tests"""
@@ -415,5 +454,279 @@ class TestContactMessages:
         print(f"Got {len(data)} contact messages")
 
 
+class TestCatalogCache:
+    """Catalog cache invalidation and stats"""
+
+    def test_update_invalidates_cached_list(self, auth_session):
+        product_data = {
+            "name": f"TEST_Cache_{uuid.uuid4().hex[:8]}",
+            "category": "Integratori",
+            "price": 10.00,
+            "image": "https://example.com/image.jpg",
+            "description": "Cache invalidation test product"
+        }
+        product_id = auth_session.post(f"{API}/products", json=product_data).json()["id"]
+        try:
+            # Warm the cache, then write and read again
+            auth_session.get(f"{API}/products")
+            auth_session.put(f"{API}/products/{product_id}", json={"price": 12.50})
+            products = auth_session.get(f"{API}/products").json()
+            updated = next(p for p in products if p["id"] == product_id)
+            assert updated["price"] == 12.50
+        finally:
+            auth_session.delete(f"{API}/products/{product_id}")
+
+    def test_repository_stats(self, auth_session):
+        auth_session.get(f"{API}/products")
+        response = auth_session.get(f"{API}/repository-stats")
+        assert response.status_code == 200
+        for timing in response.json().values():
+            assert timing["count"] >= 1
+            assert timing["maxMs"] >= timing["avgMs"]
+
+    def test_cache_stats(self, auth_session):
+        response = auth_session.get(f"{API}/cache-stats")
+        assert response.status_code == 200
+        data = response.json()
+        assert "hits" in data["catalog"]
+        assert "misses" in data["catalog"]
+        assert "hitRatio" in data["availability"]
+        print(f"Catalog cache stats: {data['catalog']}")
+
+
+class TestConditionalRequests:
+    """ETag revalidation on catalog reads"""
+
+    @pytest.mark.parametrize("path", ["/products", "/services", "/blog"])
+    def test_if_none_match_returns_304(self, session, path):
+        response = session.get(f"{API}{path}")
+        assert response.status_code == 200
+        etag = response.headers.get("ETag")
+        assert etag
+        cached = session.get(f"{API}{path}", headers={"If-None-Match": etag})
+        assert cached.status_code == 304
+        assert cached.content == b""
+        assert cached.headers.get("ETag") == etag
+
+    def test_stale_etag_returns_body(self, session):
+        response = session.get(f"{API}/products", headers={"If-None-Match": '"stale"'})
+        assert response.status_code == 200
+        assert isinstance(response.json(), list)
+
+
+class TestCursorPagination:
+    """Keyset pagination on admin listings"""
+
+    @pytest.mark.parametrize("path", ["/orders", "/bookings", "/blog", "/contact"])
+    def test_cursor_envelope(self, auth_session, path):
+        response = auth_session.get(f"{API}{path}", params={"cursor": "", "limit": 2})
+        assert response.status_code == 200
+        data = response.json()
+        assert isinstance(data["items"], list)
+        assert "nextCursor" in data
+
+    def test_cursor_pages_do_not_overlap(self, auth_session):
+        first = auth_session.get(f"{API}/contact", params={"cursor": "", "limit": 2}).json()
+        if not first["nextCursor"]:
+            pytest.skip("Not enough contact messages to page")
+        second = auth_session.get(f"{API}/contact", params={"cursor": first["nextCursor"], "limit": 2}).json()
+        first_ids = {m["id"] for m in first["items"]}
+        assert not first_ids & {m["id"] for m in second["items"]}
+
+    def test_invalid_cursor(self, auth_session):
+        response = auth_session.get(f"{API}/orders", params={"cursor": "not-a-cursor"})
+        assert response.status_code == 400
+
+
+class TestBookingConcurrency:
+    """Concurrent reservations of the same slot"""
+
+    def test_one_winner_per_slot(self, auth_session):
+        services = requests.get(f"{API}/services").json()
+        if not services:
+            pytest.skip("No services available")
+        # A far-future slot nobody else is using
+        slot_date = f"2099-{random.randint(1, 12):02d}-{random.randint(1, 28):02d}"
+        booking_data = {
+            "serviceId": services[0]["id"],
+            "date": slot_date,
+            "time": "10:00",
+            "customer": {"name": "TEST Load", "email": "load@example.com", "phone": "+39123456789"},
+            "notes": "concurrency test"
+        }
+
+        def reserve(_):
+            return requests.post(f"{API}/bookings", json=booking_data, timeout=30)
+
+        with ThreadPoolExecutor(max_workers=100) as pool:
+            responses = list(pool.map(reserve, range(100)))
+
+        winners = [r for r in responses if r.status_code == 200]
+        losers = [r for r in responses if r.status_code == 400]
+        try:
+            assert len(winners) == 1
+            assert len(losers) == 99
+        finally:
+            for winner in winners:
+                auth_session.put(f"{API}/bookings/{winner.json()['id']}", json={"status": "cancelled"})
+        print(f"Slot {slot_date} 10:00: 1 winner, {len(losers)} rejected")
+
+
+class TestProductFilters:
+    """Server-side catalog filters, sorting and facets"""
+
+    def test_filter_sort_and_facets(self, auth_session):
+        category = f"TEST_Cat_{uuid.uuid4().hex[:8]}"
+        product_ids = []
+        for price, gluten_free in ((30.0, True), (10.0, False), (20.0, True)):
+            product_ids.append(auth_session.post(f"{API}/products", json={
+                "name": f"TEST_Filter_{price}",
+                "category": category,
+                "price": price,
+                "image": "https://example.com/image.jpg",
+                "description": "Filter test product",
+                "glutenFree": gluten_free
+            }).json()["id"])
+        try:
+            response = auth_session.get(f"{API}/products", params={"category": category, "sort": "price_asc"})
+            assert [p["price"] for p in response.json()] == [10.0, 20.0, 30.0]
+
+            response = auth_session.get(
+                f"{API}/products", params={"category": category, "glutenFree": True, "maxPrice": 25}
+            )
+            assert [p["price"] for p in response.json()] == [20.0]
+
+            facets = auth_session.get(f"{API}/products-facets", params={"category": category}).json()
+            assert facets["total"] == 3
+            assert facets["glutenFree"] == 2
+            assert facets["price"] == {"min": 10.0, "max": 30.0}
+            assert {"value": category, "count": 3} in facets["categories"]
+        finally:
+            for product_id in product_ids:
+                auth_session.delete(f"{API}/products/{product_id}")
+
+    def test_invalid_sort(self, session):
+        response = session.get(f"{API}/products", params={"sort": "random"})
+        assert response.status_code == 422
+
+
+class TestSparseFieldsets:
+    """Compact list views and fields= projection"""
+
+    def test_product_list_defaults_to_card(self, session):
+        response = session.get(f"{API}/products")
+        assert response.status_code == 200
+        for product in response.json():
+            assert "fullDescription" not in product
+            assert "nutritionalInfo" not in product
+            assert {"id", "name", "price", "image"} <= set(product)
+
+    def test_full_view_and_fields(self, session):
+        full = session.get(f"{API}/products", params={"view": "full"}).json()
+        if full:
+            assert "fullDescription" in full[0]
+        products = session.get(f"{API}/products", params={"fields": "name,price"}).json()
+        for product in products:
+            assert set(product) == {"id", "name", "price"}
+
+    def test_blog_card_omits_content(self, session):
+        for post in session.get(f"{API}/blog").json():
+            assert "content" not in post
+
+    def test_unknown_field(self, session):
+        response = session.get(f"{API}/products", params={"fields": "name,secret"})
+        assert response.status_code == 400
+
+
+class TestSearch:
+    """Full-text catalog search"""
+
+    def test_search_ranks_products_with_stemming(self, auth_session):
+        stem = "metis" + "".join(random.choices("bcdfglmnprstvz", k=8))
+        product_data = {
+            "name": f"TEST_Search {stem}o",
+            "category": "Integratori",
+            "price": 10.00,
+            "image": "https://example.com/image.jpg",
+            "description": "Integratore per la vitalità quotidiana"
+        }
+        product_id = auth_session.post(f"{API}/products", json=product_data).json()["id"]
+        try:
+            response = auth_session.get(f"{API}/search", params={"q": f"{stem}o", "type": "products"})
+            assert response.status_code == 200
+            data = response.json()
+            assert data["items"][0]["item"]["id"] == product_id
+            assert data["items"][0]["type"] == "products"
+
+            # The plural shares the Italian stem
+            response = auth_session.get(f"{API}/search", params={"q": f"{stem}i", "type": "products"})
+            assert response.json()["items"][0]["item"]["id"] == product_id
+        finally:
+            auth_session.delete(f"{API}/products/{product_id}")
+
+    def test_search_query_too_short(self, session):
+        response = session.get(f"{API}/search", params={"q": "a"})
+        assert response.status_code == 400
+
+
+class TestBulkImportExport:
+    """Bulk NDJSON/CSV catalog import and export"""
+
+    def test_csv_import_reports_bad_rows(self, auth_session):
+        product_id = f"TEST_Bulk_{uuid.uuid4().hex[:8]}"
+        body = (
+            "id,name,category,price,image,description,benefits\n"
+            f"{product_id},Bulk Product,Integratori,9.90,https://example.com/i.jpg,Bulk test,Energia|Focus\n"
+            "TEST_Bulk_bad,Bad Product,Integratori,not-a-number,https://example.com/i.jpg,Bad row,\n"
+        )
+        response = auth_session.post(
+            f"{API}/admin/bulk/products", data=body.encode(), headers={"Content-Type": "text/csv"}
+        )
+        try:
+            assert response.status_code == 200
+            report = response.json()
+            assert report["received"] == 2
+            assert report["inserted"] == 1
+            assert [error["row"] for error in report["errors"]] == [3]
+
+            product = auth_session.get(f"{API}/products/{product_id}").json()
+            assert product["benefits"] == ["Energia", "Focus"]
+
+            export = auth_session.get(f"{API}/admin/bulk/products")
+            assert export.headers["content-type"].startswith("application/x-ndjson")
+            assert product_id in export.text
+        finally:
+            auth_session.delete(f"{API}/products/{product_id}")
+
+    def test_unknown_collection(self, auth_session):
+        response = auth_session.get(f"{API}/admin/bulk/orders")
+        assert response.status_code == 404
+
+    def test_non_utf8_csv(self, auth_session):
+        body = "id,name\nTEST_Bulk_latin,Caffè\n".encode("latin-1")
+        response = auth_session.post(
+            f"{API}/admin/bulk/products", data=body, headers={"Content-Type": "text/csv"}
+        )
+        assert response.status_code == 400
+        assert "UTF-8" in response.json()["detail"]
+
+
+class TestProfiles:
+    """Request profile traces (admin only)"""
+
+    def test_profiles_require_admin(self):
+        # Fresh request: the shared session carries the admin token once auth_session ran
+        response = requests.get(f"{API}/admin/profiles")
+        assert response.status_code in (401, 403)
+
+    def test_list_profiles(self, auth_session):
+        response = auth_session.get(f"{API}/admin/profiles")
+        assert response.status_code == 200
+        assert "enabled" in response.json()
+
+    def test_unknown_trace(self, auth_session):
+        assert auth_session.get(f"{API}/admin/profiles/not-a-trace").status_code == 404
+
+
 if __name__ == "__main__":
     pytest.main([__file__, "-v", "--tb=short"])
@@ -0,0 +1,78 @@
+"""
+Reference scan of `python uploads.py gc`, run against a temporary uploads directory
+"""
+import asyncio
+import os
+import sys
+import time
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from uploads import UPLOAD_GC_GRACE_SECONDS, collect_garbage, content_path  # noqa: E402
+
+
+class Collection:
+    """The slice of a Motor collection collect_garbage uses"""
+
+    def __init__(self, docs=()):
+        self.docs = list(docs)
+        self.deleted = []
+
+    async def _iterate(self):
+        for doc in self.docs:
+            yield doc
+
+    def find(self, *args, **kwargs):
+        return self._iterate()
+
+    async def delete_many(self, query):
+        self.deleted.append(query)
+
+
+class Database(dict):
+    def __missing__(self, name):
+        return self.setdefault(name, Collection())
+
+    def __getattr__(self, name):
+        return self[name]
+
+
+def stored_file(directory: Path, char: str) -> tuple[Path, str]:
+    relative = content_path(char * 64, ".jpg")
+    path = directory / relative
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_bytes(b"jpeg")
+    # Older than the grace period
+    expired = time.time() - UPLOAD_GC_GRACE_SECONDS - 60
+    os.utime(path, (expired, expired))
+    return path, f"/api/uploads/{relative}"
+
+
+@pytest.fixture
+def uploads_dir(tmp_path):
+    return tmp_path / "uploads"
+
+
+def test_order_image_survives_gc(uploads_dir):
+    ordered, ordered_url = stored_file(uploads_dir, "a")
+    orphan, _ = stored_file(uploads_dir, "b")
+    db = Database(orders=Collection([
+        {"items": [{"productId": "p1", "name": "Omega 3", "price": 10.0, "quantity": 1, "image": ordered_url}]}
+    ]))
+
+    removed = asyncio.run(collect_garbage(db, uploads_dir))
+
+    assert removed == [orphan]
+    assert ordered.exists()
+    assert not orphan.exists()
+
+
+def test_catalog_image_survives_gc(uploads_dir):
+    current, current_url = stored_file(uploads_dir, "c")
+    db = Database(products=Collection([{"image": current_url}]))
+
+    assert asyncio.run(collect_garbage(db, uploads_dir)) == []
+    assert current.exists()
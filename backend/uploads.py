@@ -0,0 +1,222 @@
+"""
+Content-addressed storage for uploaded images.
+
+Files are stored as uploads/<aa>/<bb>/<sha256><ext>, so identical bytes are
+written once and a stored file never changes. Run `python uploads.py gc` to
+remove stored files that no product, service, blog post or order references any more
+(`--dry-run` only lists them).
+"""
+import asyncio
+import hashlib
+import os
+import re
+import sys
+import time
+import uuid
+from datetime import datetime
+from pathlib import Path
+from typing import NamedTuple
+
+from fastapi import HTTPException, UploadFile
+from starlette.concurrency import run_in_threadpool
+from starlette.datastructures import Headers
+from starlette.responses import JSONResponse
+from starlette.types import ASGIApp, Receive, Scope, Send
+
+ROOT_DIR = Path(__file__).parent
+UPLOADS_DIR = ROOT_DIR / "uploads"
+
+UPLOAD_MAX_BYTES = int(os.environ.get("UPLOAD_MAX_BYTES", str(10 * 1024 * 1024)))
+UPLOAD_CHUNK_SIZE = 256 * 1024
+# Allowance for multipart boundaries and part headers around the file itself
+UPLOAD_MULTIPART_OVERHEAD = 64 * 1024
+# Unreferenced files younger than this are kept: the admin may not have saved the form yet
+UPLOAD_GC_GRACE_SECONDS = int(os.environ.get("UPLOAD_GC_GRACE_SECONDS", str(24 * 3600)))
+
+# Matches stored files and their derivatives, capturing the content hash
+HASHED_PATH_RE = re.compile(r"(?:derived/)?[0-9a-f]{2}/[0-9a-f]{2}/([0-9a-f]{64})(?:-\d+)?\.\w+")
+
+
+class StoredUpload(NamedTuple):
+    path: str  # relative to the uploads directory, POSIX separators
+    digest: str
+    size: int
+    created: bool  # False when identical bytes were already stored
+
+
+def sniff_image_type(head: bytes) -> str | None:
+    """Return the file extension matching the image magic bytes, if supported."""
+    if head.startswith(b"\xff\xd8\xff"):
+        return ".jpg"
+    if head.startswith(b"\x89PNG\r\n\x1a\n"):
+        return ".png"
+    if head[:6] in (b"GIF87a", b"GIF89a"):
+        return ".gif"
+    if head[:4] == b"RIFF" and head[8:12] == b"WEBP":
+        return ".webp"
+    return None
+
+
+def content_path(digest: str, file_ext: str) -> str:
+    return f"{digest[:2]}/{digest[2:4]}/{digest}{file_ext}"
+
+
+def _format_size(size: int) -> str:
+    for unit, factor in (("MB", 1024 * 1024), ("KB", 1024)):
+        if size >= factor:
+            return f"{size / factor:.1f}".removesuffix(".0") + f" {unit}"
+    return f"{size} byte"
+
+
+def _too_large(max_bytes: int) -> HTTPException:
+    return HTTPException(
+        status_code=413,
+        detail=f"File troppo grande (massimo {_format_size(max_bytes)})"
+    )
+
+
+class UploadSizeLimitMiddleware:
+    """Answer 413 from Content-Length before the multipart body is received.
+
+    FastAPI parses (and spools to disk) the whole form before the endpoint runs.
+    Chunked bodies carry no length; save_upload still enforces the limit on those.
+    """
+
+    def __init__(self, app: ASGIApp, path: str = "/api/upload", max_bytes: int = UPLOAD_MAX_BYTES):
+        self.app = app
+        self.path = path
+        self.max_bytes = max_bytes
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] == "http" and scope["path"] == self.path and scope["method"] == "POST":
+            content_length = Headers(scope=scope).get("content-length", "")
+            if content_length.isdigit() and int(content_length) > self.max_bytes + UPLOAD_MULTIPART_OVERHEAD:
+                error = _too_large(self.max_bytes)
+                response = JSONResponse({"detail": error.detail}, status_code=error.status_code)
+                await response(scope, receive, send)
+                return
+        await self.app(scope, receive, send)
+
+
+async def save_upload(file: UploadFile, directory: Path, max_bytes: int = UPLOAD_MAX_BYTES) -> StoredUpload:
+    """Stream an uploaded image to `directory` in chunks, stored under its sha256.
+
+    Disk writes run in the thread pool so a large upload never blocks the event loop.
+    """
+    if file.size is not None and file.size > max_bytes:
+        raise _too_large(max_bytes)
+
+    chunk = await file.read(UPLOAD_CHUNK_SIZE)
+    file_ext = sniff_image_type(chunk[:12])
+    if file_ext is None:
+        raise HTTPException(status_code=400, detail="Formato file non supportato")
+
+    partial_path = directory / f".{uuid.uuid4()}.part"
+    digest = hashlib.sha256()
+    size = 0
+    buffer = await run_in_threadpool(open, partial_path, "wb")
+    try:
+        while chunk:
+            size += len(chunk)
+            if size > max_bytes:
+                raise _too_large(max_bytes)
+            digest.update(chunk)
+            await run_in_threadpool(buffer.write, chunk)
+            chunk = await file.read(UPLOAD_CHUNK_SIZE)
+        await run_in_threadpool(buffer.close)
+
+        relative = content_path(digest.hexdigest(), file_ext)
+        target = directory / relative
+        created = not target.exists()
+        if created:
+            target.parent.mkdir(parents=True, exist_ok=True)
+            await run_in_threadpool(os.replace, partial_path, target)
+    finally:
+        buffer.close()
+        partial_path.unlink(missing_ok=True)
+    return StoredUpload(path=relative, digest=digest.hexdigest(), size=size, created=created)
+
+
+async def register_upload(db, stored: StoredUpload, srcset: dict) -> None:
+    """Record the stored file in the reference index (one document per content hash)."""
+    now = datetime.utcnow()
+    await db.uploads.update_one(
+        {"_id": stored.digest},
+        {
+            "$set": {"path": stored.path, "size": stored.size, "srcset": srcset, "lastUploadedAt": now},
+            "$setOnInsert": {"createdAt": now},
+            "$inc": {"uploadCount": 1},
+        },
+        upsert=True
+    )
+
+
+async def referenced_digests(db) -> set[str]:
+    """Content hashes referenced by any catalog document's image or imageSrcset,
+    or by an order item (orders keep the product image they were placed with)."""
+    digests = set()
+    for collection in ("products", "services", "blog_posts"):
+        async for doc in db[collection].find({}, {"_id": 0, "image": 1, "imageSrcset": 1}):
+            values = [doc.get("image") or ""] + list((doc.get("imageSrcset") or {}).values())
+            for value in values:
+                digests.update(HASHED_PATH_RE.findall(value))
+    async for order in db.orders.find({}, {"_id": 0, "items.image": 1}):
+        for item in order.get("items") or []:
+            digests.update(HASHED_PATH_RE.findall(item.get("image") or ""))
+    return digests
+
+
+async def collect_garbage(db, directory: Path = UPLOADS_DIR, dry_run: bool = False) -> list[Path]:
+    """Delete content-addressed files (and derivatives) nobody references.
+
+    Files outside the hashed layout, e.g. the bundled site images, are never touched.
+    """
+    referenced = await referenced_digests(db)
+    cutoff = time.time() - UPLOAD_GC_GRACE_SECONDS
+    # A dedup re-upload leaves the file's mtime alone but bumps lastUploadedAt
+    async for doc in db.uploads.find(
+        {"lastUploadedAt": {"$gt": datetime.utcfromtimestamp(cutoff)}}, {"_id": 1}
+    ):
+        referenced.add(doc["_id"])
+    removed = []
+    orphaned = set()
+    for path in directory.rglob("*"):
+        match = HASHED_PATH_RE.fullmatch(path.relative_to(directory).as_posix())
+        if not match or match.group(1) in referenced or path.stat().st_mtime > cutoff:
+            continue
+        removed.append(path)
+        orphaned.add(match.group(1))
+        if not dry_run:
+            path.unlink()
+    if orphaned and not dry_run:
+        await db.uploads.delete_many({"_id": {"$in": list(orphaned)}})
+        # Prune shard directories left empty
+        for parent in sorted({p.parent for p in removed}, key=lambda p: len(p.parts), reverse=True):
+            while parent != directory and parent.exists() and not any(parent.iterdir()):
+                parent.rmdir()
+                parent = parent.parent
+    return removed
+
+
+async def main(argv: list[str]):
+    from motor.motor_asyncio import AsyncIOMotorClient
+    from dotenv import load_dotenv
+
+    if argv[:1] != ["gc"]:
+        print("Uso: python uploads.py gc [--dry-run]")
+        return
+    dry_run = "--dry-run" in argv
+
+    load_dotenv(ROOT_DIR / '.env')
+    client = AsyncIOMotorClient(os.environ['MONGO_URL'])
+    db = client[os.environ['DB_NAME']]
+
+    removed = await collect_garbage(db, dry_run=dry_run)
+    for path in removed:
+        print(f"  {'(dry run) ' if dry_run else ''}✗ {path.relative_to(UPLOADS_DIR)}")
+    print(f"\n✅ {len(removed)} file non referenziati {'trovati' if dry_run else 'rimossi'}")
+    client.close()
+
+
+if __name__ == "__main__":
+    asyncio.run(main(sys.argv[1:]))
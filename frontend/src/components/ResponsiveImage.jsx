@@ -0,0 +1,38 @@
+import React from 'react';
+
+const BACKEND_URL = process.env.REACT_APP_BACKEND_URL;
+
+// Most compact formats first: the browser takes the first <source> it supports
+const FORMAT_ORDER = ['image/avif', 'image/webp'];
+
+// Derived image URLs are stored relative to the backend, like upload URLs
+const absoluteSrcset = (srcset) =>
+  srcset
+    .split(',')
+    .map((candidate) => candidate.trim())
+    .map((candidate) => (candidate.startsWith('/') ? `${BACKEND_URL}${candidate}` : candidate))
+    .join(', ');
+
+const formatRank = (type) => {
+  const rank = FORMAT_ORDER.indexOf(type);
+  return rank === -1 ? FORMAT_ORDER.length : rank;
+};
+
+// `srcset` is the imageSrcset map (MIME type -> "url 320w, url 640w"); without one this is a plain <img>
+const ResponsiveImage = ({ src, srcset, sizes, alt, ...props }) => {
+  const sources = Object.entries(srcset || {}).sort(([a], [b]) => formatRank(a) - formatRank(b));
+  if (sources.length === 0) {
+    return <img src={src} alt={alt} {...props} />;
+  }
+
+  return (
+    <picture className="contents">
+      {sources.map(([type, candidates]) => (
+        <source key={type} type={type} srcSet={absoluteSrcset(candidates)} sizes={sizes} />
+      ))}
+      <img src={src} alt={alt} {...props} />
+    </picture>
+  );
+};
+
+export default ResponsiveImage;
@@ -1,6 +1,7 @@
 import React, { useState, useEffect } from 'react';
 import { getBlogPosts } from '../services/api';
 import { Card, CardContent } from '../components/ui/card';
+import ResponsiveImage from '../components/ResponsiveImage';
 import { Link } from 'react-router-dom';
 import { Calendar, User, ArrowRight } from 'lucide-react';
 import { toast } from '../hooks/use-toast';
@@ -57,8 +58,10 @@ const Blog = () => {
           {blogPosts.map((post) => (
             <Card key={post.id} className="overflow-hidden hover:shadow-xl transition-all duration-300 group flex flex-col">
               <div className="relative h-56 overflow-hidden">
-                <img
+                <ResponsiveImage
                   src={post.image}
+                  srcset={post.imageSrcset}
+                  sizes="(min-width: 1024px) 33vw, (min-width: 768px) 50vw, 100vw"
                   alt={post.title}
                   className="w-full h-full object-cover group-hover:scale-110 transition-transform duration-300"
                 />
@@ -3,6 +3,7 @@ import { Link } from 'react-router-dom';
 import { ArrowRight, CheckCircle, Calendar, Heart, Star } from 'lucide-react';
 import { Button } from '../components/ui/button';
 import { Card, CardContent } from '../components/ui/card';
+import ResponsiveImage from '../components/ResponsiveImage';
 import { getProducts, getServices, getBlogPosts } from '../services/api';
 import { testimonials } from '../mock/mockData';
 import { useCart } from '../context/CartContext';
@@ -171,8 +172,10 @@ const Home = () => {
             {featuredServices.map((service) => (
               <Card key={service.id} className="overflow-hidden hover:shadow-xl transition-all duration-300 group">
                 <div className="relative h-48 overflow-hidden">
-                  <img 
-                    src={service.image} 
+                  <ResponsiveImage
+                    src={service.image}
+                    srcset={service.imageSrcset}
+                    sizes="(min-width: 768px) 33vw, 100vw"
                     alt={service.title} 
                     className="w-full h-full object-cover group-hover:scale-110 transition-transform duration-300"
                   />
@@ -219,8 +222,10 @@ const Home = () => {
             {featuredProducts.map((product) => (
               <Card key={product.id} className="overflow-hidden hover:shadow-xl transition-all duration-300 group">
                 <div className="relative h-48 overflow-hidden bg-gray-100">
-                  <img 
-                    src={product.image} 
+                  <ResponsiveImage
+                    src={product.image}
+                    srcset={product.imageSrcset}
+                    sizes="(min-width: 1024px) 25vw, (min-width: 640px) 50vw, 100vw"
                     alt={product.name} 
                     className="w-full h-full object-cover group-hover:scale-110 transition-transform duration-300"
                   />
@@ -299,8 +304,10 @@ const Home = () => {
             {blogPosts.map((post) => (
               <Card key={post.id} className="overflow-hidden hover:shadow-xl transition-all duration-300 group">
                 <div className="relative h-48 overflow-hidden">
-                  <img 
-                    src={post.image} 
+                  <ResponsiveImage
+                    src={post.image}
+                    srcset={post.imageSrcset}
+                    sizes="(min-width: 768px) 33vw, 100vw"
                     alt={post.title} 
                     className="w-full h-full object-cover group-hover:scale-110 transition-transform duration-300"
                   />
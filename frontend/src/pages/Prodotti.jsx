@@ -1,9 +1,10 @@
 import React, { useState, useEffect } from 'react';
 import { Link } from 'react-router-dom';
-import { getProducts } from '../services/api';
+import { getProducts, searchCatalog } from '../services/api';
 import { Card, CardContent } from '../components/ui/card';
 import { Button } from '../components/ui/button';
 import { Input } from '../components/ui/input';
+import ResponsiveImage from '../components/ResponsiveImage';
 import { useCart } from '../context/CartContext';
 import { toast } from '../hooks/use-toast';
 import { Search, ShoppingCart, Eye } from 'lucide-react';
@@ -11,6 +12,7 @@ import { Search, ShoppingCart, Eye } from 'lucide-react';
 const Prodotti = () => {
   const [searchTerm, setSearchTerm] = useState('');
   const [products, setProducts] = useState([]);
+  const [searchResults, setSearchResults] = useState(null);
   const [loading, setLoading] = useState(true);
   const { addToCart } = useCart();
 
@@ -34,10 +36,29 @@ const Prodotti = () => {
     fetchProducts();
   }, []);
 
-  const filteredProducts = products.filter(product =>
-    product.name.toLowerCase().includes(searchTerm.toLowerCase()) ||
-    product.description.toLowerCase().includes(searchTerm.toLowerCase())
-  );
+  // Search the whole catalog server-side (ranked, Italian stemming) once the user pauses typing
+  useEffect(() => {
+    const term = searchTerm.trim();
+    if (term.length < 2) {
+      setSearchResults(null);
+      return;
+    }
+    let cancelled = false;
+    const timer = setTimeout(async () => {
+      try {
+        const data = await searchCatalog(term, 'products', 0, 50);
+        if (!cancelled) setSearchResults(data.items.map((result) => result.item));
+      } catch (error) {
+        console.error('Error searching products:', error);
+      }
+    }, 250);
+    return () => {
+      cancelled = true;
+      clearTimeout(timer);
+    };
+  }, [searchTerm]);
+
+  const filteredProducts = searchResults ?? products;
 
   const handleAddToCart = (product) => {
     addToCart(product);
@@ -90,8 +111,10 @@ const Prodotti = () => {
           {filteredProducts.map((product) => (
             <Card key={product.id} className="overflow-hidden hover:shadow-xl transition-all duration-300 group flex flex-col">
               <Link to={`/prodotti/${product.id}`} className="relative h-64 overflow-hidden bg-white">
-                <img
+                <ResponsiveImage
                   src={product.image}
+                  srcset={product.imageSrcset}
+                  sizes="(min-width: 1024px) 33vw, (min-width: 640px) 50vw, 100vw"
                   alt={product.name}
                   className="w-full h-full object-contain p-4 group-hover:scale-105 transition-transform duration-300"
                 />
@@ -2,6 +2,7 @@ import React, { useState, useEffect } from 'react';
 import { getServices } from '../services/api';
 import { Card, CardContent } from '../components/ui/card';
 import { Button } from '../components/ui/button';
+import ResponsiveImage from '../components/ResponsiveImage';
 import { Link } from 'react-router-dom';
 import { Phone, Calendar, ArrowRight } from 'lucide-react';
 import { toast } from '../hooks/use-toast';
@@ -72,8 +73,10 @@ const Servizi = () => {
               {categoryServices.map((service) => (
                 <Card key={service.id} className="overflow-hidden hover:shadow-xl transition-all duration-300 group flex flex-col">
                   <div className="relative h-48 overflow-hidden">
-                    <img
+                    <ResponsiveImage
                       src={service.image}
+                      srcset={service.imageSrcset}
+                      sizes="(min-width: 1024px) 33vw, (min-width: 768px) 50vw, 100vw"
                       alt={service.title}
                       className="w-full h-full object-cover group-hover:scale-110 transition-transform duration-300"
                     />
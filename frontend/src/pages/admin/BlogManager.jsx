@@ -28,6 +28,7 @@ const BlogManager = () => {
     author: '',
     date: '',
     image: '',
+    imageSrcset: {},
     category: '',
     published: true
   });
@@ -40,7 +41,7 @@ const BlogManager = () => {
 
   const fetchPosts = async () => {
     try {
-      const data = await getBlogPosts();
+      const data = await getBlogPosts(null, 'full');
       setPosts(data);
     } catch (error) {
       console.error('Error fetching posts:', error);
@@ -59,6 +60,7 @@ const BlogManager = () => {
         author: post.author,
         date: post.date,
         image: post.image,
+        imageSrcset: post.imageSrcset || {},
         category: post.category,
         published: post.published
       });
@@ -72,6 +74,7 @@ const BlogManager = () => {
         author: 'Centro Metis',
         date: today,
         image: '',
+        imageSrcset: {},
         category: '',
         published: true
       });
@@ -91,7 +94,7 @@ const BlogManager = () => {
     setUploadingImage(true);
     try {
       const result = await uploadFile(file);
-      setFormData(prev => ({ ...prev, image: `${BACKEND_URL}${result.url}` }));
+      setFormData(prev => ({ ...prev, image: `${BACKEND_URL}${result.url}`, imageSrcset: result.srcset || {} }));
     } catch (error) {
       console.error('Error uploading image:', error);
       alert('Errore nel caricamento dell\'immagine');
@@ -343,7 +346,7 @@ const BlogManager = () => {
               <div className="flex gap-2">
                 <Input
                   value={formData.image}
-                  onChange={(e) => setFormData(prev => ({ ...prev, image: e.target.value }))}
+                  onChange={(e) => setFormData(prev => ({ ...prev, image: e.target.value, imageSrcset: {} }))}
                   placeholder="URL immagine o carica file"
                   className="flex-1"
                   data-testid="blog-image-input"
@@ -376,7 +379,7 @@ const BlogManager = () => {
                   />
                   <button
                     type="button"
-                    onClick={() => setFormData(prev => ({ ...prev, image: '' }))}
+                    onClick={() => setFormData(prev => ({ ...prev, image: '', imageSrcset: {} }))}
                     className="absolute -top-2 -right-2 bg-red-500 text-white rounded-full p-1"
                   >
                     <X className="w-3 h-3" />
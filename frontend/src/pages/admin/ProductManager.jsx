@@ -27,6 +27,7 @@ const ProductManager = () => {
     price: '',
     description: '',
     image: '',
+    imageSrcset: {},
     inStock: true,
     featured: false
   });
@@ -39,7 +40,7 @@ const ProductManager = () => {
 
   const fetchProducts = async () => {
     try {
-      const data = await getProducts();
+      const data = await getProducts(null, { view: 'full' });
       setProducts(data);
     } catch (error) {
       console.error('Error fetching products:', error);
@@ -57,6 +58,7 @@ const ProductManager = () => {
         price: product.price.toString(),
         description: product.description,
         image: product.image,
+        imageSrcset: product.imageSrcset || {},
         inStock: product.inStock,
         featured: product.featured
       });
@@ -68,6 +70,7 @@ const ProductManager = () => {
         price: '',
         description: '',
         image: '',
+        imageSrcset: {},
         inStock: true,
         featured: false
       });
@@ -87,7 +90,7 @@ const ProductManager = () => {
     setUploadingImage(true);
     try {
       const result = await uploadFile(file);
-      setFormData(prev => ({ ...prev, image: `${BACKEND_URL}${result.url}` }));
+      setFormData(prev => ({ ...prev, image: `${BACKEND_URL}${result.url}`, imageSrcset: result.srcset || {} }));
     } catch (error) {
       console.error('Error uploading image:', error);
       alert('Errore nel caricamento dell\'immagine');
@@ -316,7 +319,7 @@ const ProductManager = () => {
                 <div className="flex gap-2">
                   <Input
                     value={formData.image}
-                    onChange={(e) => setFormData(prev => ({ ...prev, image: e.target.value }))}
+                    onChange={(e) => setFormData(prev => ({ ...prev, image: e.target.value, imageSrcset: {} }))}
                     placeholder="URL immagine o carica file"
                     className="flex-1"
                     data-testid="product-image-input"
@@ -349,7 +352,7 @@ const ProductManager = () => {
                     />
                     <button
                       type="button"
-                      onClick={() => setFormData(prev => ({ ...prev, image: '' }))}
+                      onClick={() => setFormData(prev => ({ ...prev, image: '', imageSrcset: {} }))}
                       className="absolute -top-2 -right-2 bg-red-500 text-white rounded-full p-1"
                     >
                       <X className="w-3 h-3" />
@@ -26,7 +26,8 @@ const ServiceManager = () => {
     price: '',
     duration: '',
     description: '',
-    image: ''
+    image: '',
+    imageSrcset: {}
   });
 
   const categories = ['Trattamenti Viso', 'Trattamenti Corpo', 'Massaggi', 'Consulenze', 'Benessere'];
@@ -56,7 +57,8 @@ const ServiceManager = () => {
         price: service.price.toString(),
         duration: service.duration,
         description: service.description,
-        image: service.image
+        image: service.image,
+        imageSrcset: service.imageSrcset || {}
       });
     } else {
       setEditingService(null);
@@ -66,7 +68,8 @@ const ServiceManager = () => {
         price: '',
         duration: '',
         description: '',
-        image: ''
+        image: '',
+        imageSrcset: {}
       });
     }
     setIsDialogOpen(true);
@@ -84,7 +87,7 @@ const ServiceManager = () => {
     setUploadingImage(true);
     try {
       const result = await uploadFile(file);
-      setFormData(prev => ({ ...prev, image: `${BACKEND_URL}${result.url}` }));
+      setFormData(prev => ({ ...prev, image: `${BACKEND_URL}${result.url}`, imageSrcset: result.srcset || {} }));
     } catch (error) {
       console.error('Error uploading image:', error);
       alert('Errore nel caricamento dell\'immagine');
@@ -319,7 +322,7 @@ const ServiceManager = () => {
               <div className="flex gap-2">
                 <Input
                   value={formData.image}
-                  onChange={(e) => setFormData(prev => ({ ...prev, image: e.target.value }))}
+                  onChange={(e) => setFormData(prev => ({ ...prev, image: e.target.value, imageSrcset: {} }))}
                   placeholder="URL immagine o carica file"
                   className="flex-1"
                   data-testid="service-image-input"
@@ -352,7 +355,7 @@ const ServiceManager = () => {
                   />
                   <button
                     type="button"
-                    onClick={() => setFormData(prev => ({ ...prev, image: '' }))}
+                    onClick={() => setFormData(prev => ({ ...prev, image: '', imageSrcset: {} }))}
                     className="absolute -top-2 -right-2 bg-red-500 text-white rounded-full p-1"
                   >
                     <X className="w-3 h-3" />
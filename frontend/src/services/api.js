@@ -47,12 +47,20 @@ export const uploadFile = async (file) => {
 };
 
 // ============= PRODUCTS =============
-export const getProducts = async (featured = null) => {
-  const params = featured !== null ? { featured } : {};
+// filters: { category, brand, flavor, minPrice, maxPrice, inStock, glutenFree, lactoseFree, sort, skip, limit }
+// Lists return compact cards; pass { view: 'full' } (or fields: 'a,b') for every field
+export const getProducts = async (featured = null, filters = {}) => {
+  const params = featured !== null ? { ...filters, featured } : { ...filters };
   const response = await api.get('/products', { params });
   return response.data;
 };
 
+// Counts per category/brand/flavor, price range and flag totals for the same filters
+export const getProductFacets = async (filters = {}) => {
+  const response = await api.get('/products-facets', { params: filters });
+  return response.data;
+};
+
 export const getProduct = async (id) => {
   const response = await api.get(`/products/${id}`);
   return response.data;
@@ -155,9 +163,25 @@ export const getAvailableSlots = async (date) => {
   return response.data;
 };
 
+// Availability for every day in [from, to]: bit i of days[date] is set when slots[i] is free
+export const getAvailabilityRange = async (from, to, serviceId = null) => {
+  const params = { from, to };
+  if (serviceId) params.serviceId = serviceId;
+  const response = await api.get('/bookings-available', { params });
+  return response.data;
+};
+
+// ============= SEARCH =============
+// type: 'all' | 'products' | 'blog'; results are ranked server-side and paginated with skip
+export const searchCatalog = async (q, type = 'all', skip = 0, limit = 20) => {
+  const response = await api.get('/search', { params: { q, type, skip, limit } });
+  return response.data;
+};
+
 // ============= BLOG =============
-export const getBlogPosts = async (published = null) => {
-  const params = published !== null ? { published } : {};
+// view: 'card' (no content) or 'full'
+export const getBlogPosts = async (published = null, view = 'card') => {
+  const params = published !== null ? { published, view } : { view };
   const response = await api.get('/blog', { params });
   return response.data;
 };